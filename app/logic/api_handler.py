@@ -1,19 +1,71 @@
 # app/logic/api_handler.py
 # This file contains the logic for interacting with the Google Gemini API.
 
-import google.generativeai as genai
-from google.generativeai.types import HarmCategory, HarmBlockThreshold
-from google.api_core import exceptions as google_exceptions
 import re
+import os
+import json
+import hashlib
+import time
+import tempfile
+import threading
+
+from .settings_handler import SettingsHandler
 
 # The incorrect circular import that caused the error has been removed from here.
 
-DISABLED_SAFETY_SETTINGS = {
-    HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
-    HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
-    HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
-    HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
-}
+# The model list rarely changes, so it is cached on disk for a day.
+MODELS_CACHE_FILE = "models_cache.json"
+MODELS_CACHE_TTL = 24 * 3600
+
+# google.generativeai pulls in gRPC and protobuf, which takes hundreds of milliseconds.
+# It is imported on first use so that it stays off the application's startup path.
+_genai_module = None
+_genai_lock = threading.Lock()
+_disabled_safety_settings = None
+
+def get_genai():
+    """Imports google.generativeai on first use and returns the module. Safe to call from any thread."""
+    global _genai_module
+    if _genai_module is None:
+        with _genai_lock:
+            if _genai_module is None:
+                import google.generativeai as genai
+                _genai_module = genai
+    return _genai_module
+
+def preload_genai():
+    """Imports google.generativeai ahead of time. Meant to run on a background thread at startup."""
+    try:
+        get_genai()
+    except Exception as e:
+        print(f"Could not preload google.generativeai: {e}")
+
+def _get_disabled_safety_settings() -> dict:
+    """Builds the safety settings that turn off all content blocking."""
+    global _disabled_safety_settings
+    if _disabled_safety_settings is None:
+        from google.generativeai.types import HarmCategory, HarmBlockThreshold
+        _disabled_safety_settings = {
+            HarmCategory.HARM_CATEGORY_HARASSMENT: HarmBlockThreshold.BLOCK_NONE,
+            HarmCategory.HARM_CATEGORY_HATE_SPEECH: HarmBlockThreshold.BLOCK_NONE,
+            HarmCategory.HARM_CATEGORY_SEXUALLY_EXPLICIT: HarmBlockThreshold.BLOCK_NONE,
+            HarmCategory.HARM_CATEGORY_DANGEROUS_CONTENT: HarmBlockThreshold.BLOCK_NONE,
+        }
+    return _disabled_safety_settings
+
+# genai.configure rebuilds the library's global client, and with it the gRPC channel and its TLS session.
+# It is skipped when the key has not changed, so repeated calls keep reusing the open channel.
+_last_configured_key: str | None = None
+# Key validators can overlap, so the check and the configure happen together.
+_configure_lock = threading.Lock()
+
+def configure_api_key(api_key: str):
+    """Configures the genai library with the given key, unless it is already the active one."""
+    global _last_configured_key
+    with _configure_lock:
+        if api_key != _last_configured_key:
+            get_genai().configure(api_key=api_key)
+            _last_configured_key = api_key
 
 class GeminiAPIHandler:
     """
@@ -24,15 +76,16 @@ class GeminiAPIHandler:
         # Sanitize the key to be safe.
         if api_key:
             api_key = api_key.strip()
-        genai.configure(api_key=api_key)
+        configure_api_key(api_key)
         self.model = None
+        self.prepared_model = None
 
     def set_model(self, model_name: str):
         """Sets the generative model to be used for requests."""
         try:
             # We need to make sure model_name is not None or empty
             if model_name:
-                self.model = genai.GenerativeModel(model_name)
+                self.model = get_genai().GenerativeModel(model_name)
                 print(f"Model set to: {model_name}")
             else:
                 print("Error: Model name is empty. Cannot set model.")
@@ -40,42 +93,54 @@ class GeminiAPIHandler:
         except Exception as e:
             print(f"Error setting model: {e}")
             self.model = None
+        # Any previously prepared model belongs to the old model name.
+        self.prepared_model = None
 
-    def generate_content(self, system_prompt: str, user_prompt: str) -> str:
+    def prepare(self, system_prompt: str):
         """
-        Generates content using the configured model.
-
-        Args:
-            system_prompt: The instructions for the AI.
-            user_prompt: The content to be processed (e.g., file content).
-
-        Returns:
-            The generated text from the AI, or an error message.
+        Builds the model with the system prompt attached. Call this once before
+        a run; every generate_content call then reuses the same model.
         """
+        self.prepared_model = None
         if not self.model:
-            return "ERROR: Model is not set or failed to initialize."
-
+            return
         try:
-            # Re-creating the model with the system prompt for this generation
             # This is how system prompts are handled correctly in the genai library
-            model_with_system_prompt = genai.GenerativeModel(
+            self.prepared_model = get_genai().GenerativeModel(
                 self.model.model_name,
                 system_instruction=system_prompt
             )
+        except Exception as e:
+            print(f"Error preparing model: {e}")
+
+    def generate_content(self, user_prompt: str) -> tuple[bool, str]:
+        """
+        Generates content using the model built by prepare().
+
+        Args:
+            user_prompt: The content to be processed (e.g., file content).
 
+        Returns:
+            A tuple containing a boolean (True on success, False otherwise)
+            and either the generated text or an error message.
+        """
+        if not self.prepared_model:
+            return (False, "Model is not set or failed to initialize.")
+
+        try:
             # --- FIX START ---
             # Removed all logic related to 'tools' and 'use_grounding' as the
             # feature is not supported and caused errors.
-            response = model_with_system_prompt.generate_content(
+            response = self.prepared_model.generate_content(
                 user_prompt,
-                safety_settings=DISABLED_SAFETY_SETTINGS
+                safety_settings=_get_disabled_safety_settings()
             )
             # --- FIX END ---
-            return response.text
+            return (True, response.text)
         except Exception as e:
-            error_message = f"ERROR: An exception occurred during generation: {e}"
-            print(error_message)
-            return error_message
+            error_message = f"An exception occurred during generation: {e}"
+            print(f"ERROR: {error_message}")
+            return (False, error_message)
 
     @staticmethod
     def is_api_key_valid(api_key: str) -> tuple[bool, str]:
@@ -91,13 +156,13 @@ class GeminiAPIHandler:
 
         if not api_key:
             return (False, "Please enter an API key.")
+
+        from google.api_core import exceptions as google_exceptions
         try:
             # This configure is temporary and only for this check
-            genai.configure(api_key=api_key)
-            # A simple, low-cost operation to test the key.
-            # Using a lightweight model like flash is sufficient.
-            model = genai.GenerativeModel('gemini-2.5-flash')
-            model.count_tokens("test")
+            configure_api_key(api_key)
+            # A simple, low-cost operation to test the key: one page of the model list.
+            next(iter(get_genai().list_models(page_size=1)), None)
             return (True, "✅ API Key is valid!")
         except (google_exceptions.PermissionDenied, google_exceptions.Unauthenticated, google_exceptions.GoogleAPICallError):
             # Grouping all invalid key errors together.
@@ -108,18 +173,79 @@ class GeminiAPIHandler:
 
 
     @staticmethod
-    def get_available_models() -> list[str]:
+    def get_available_models(force_refresh: bool = False) -> list[str]:
         """
         Fetches and sorts the list of available models from the Gemini API.
+
+        The sorted list is cached on disk for MODELS_CACHE_TTL seconds. Pass
+        force_refresh=True to skip the cache. If the API cannot be reached, a
+        stale cache is preferred over the hardcoded fallback list. The cache is
+        tied to the configured API key, so a changed key always refetches.
         """
+        cache_path = os.path.join(SettingsHandler().app_config_dir, MODELS_CACHE_FILE)
+        key_hash = GeminiAPIHandler._hash_api_key(_last_configured_key)
+        if not force_refresh:
+            cached_models = GeminiAPIHandler._read_models_cache(cache_path, key_hash, max_age=MODELS_CACHE_TTL)
+            if cached_models:
+                print(f"Loaded {len(cached_models)} models from cache.")
+                return cached_models
+
         try:
             # This method is only called AFTER a key is known to be valid.
-            model_list = [m.name.replace('models/', '') for m in genai.list_models() if 'generateContent' in m.supported_generation_methods]
+            model_list = [m.name.replace('models/', '') for m in get_genai().list_models() if 'generateContent' in m.supported_generation_methods]
             print(f"Successfully fetched {len(model_list)} available models.")
-            gemini_models = sorted([m for m in model_list if 'gemini' in m], reverse=True)
-            gemma_models = sorted([m for m in model_list if 'gemma' in m and 'gemini' not in m], reverse=True)
-            other_models = sorted([m for m in model_list if 'gemini' not in m and 'gemma' not in m], reverse=True)
-            return gemini_models + gemma_models + other_models
+            # Bucket every model in a single pass: Gemini first, then Gemma, then the rest.
+            gemini_models, gemma_models, other_models = [], [], []
+            for m in model_list:
+                if 'gemini' in m:
+                    gemini_models.append(m)
+                elif 'gemma' in m:
+                    gemma_models.append(m)
+                else:
+                    other_models.append(m)
+            gemini_models.sort(reverse=True)
+            gemma_models.sort(reverse=True)
+            other_models.sort(reverse=True)
+            sorted_models = gemini_models + gemma_models + other_models
+            GeminiAPIHandler._write_models_cache(cache_path, key_hash, sorted_models)
+            return sorted_models
         except Exception as e:
             print(f"Could not fetch model list: {e}")
-            return ['gemini-1.5-pro-latest', 'gemini-2.5-flash']
\ No newline at end of file
+            stale_models = GeminiAPIHandler._read_models_cache(cache_path, key_hash)
+            if stale_models:
+                print("Using the last cached model list instead.")
+                return stale_models
+            return ['gemini-1.5-pro-latest', 'gemini-2.5-flash']
+
+    @staticmethod
+    def _hash_api_key(api_key: str | None) -> str:
+        """Returns a short fingerprint of the API key, so the key itself never lands on disk."""
+        return hashlib.sha256((api_key or '').encode('utf-8')).hexdigest()[:16]
+
+    @staticmethod
+    def _read_models_cache(cache_path: str, key_hash: str, max_age: float | None = None) -> list[str] | None:
+        """
+        Returns the cached model list, or None if it is missing, unreadable,
+        older than max_age seconds or was fetched with a different API key.
+        """
+        try:
+            if max_age is not None and time.time() - os.path.getmtime(cache_path) >= max_age:
+                return None
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return None
+        if not isinstance(cache, dict) or cache.get('key') != key_hash:
+            return None
+        models = cache.get('models')
+        return models if isinstance(models, list) else None
+
+    @staticmethod
+    def _write_models_cache(cache_path: str, key_hash: str, models: list[str]):
+        """Writes the model list atomically so a crash never leaves a half-written cache."""
+        try:
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=os.path.dirname(cache_path), delete=False) as f:
+                json.dump({'key': key_hash, 'models': models}, f)
+            os.replace(f.name, cache_path)
+        except OSError as e:
+            print(f"Could not write model cache: {e}")
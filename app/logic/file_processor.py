@@ -3,8 +3,19 @@
 
 import os
 import time
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, as_completed, wait
+from typing import Iterator
 from PySide6.QtCore import QObject, Signal
 from .api_handler import GeminiAPIHandler
+from .response_cache import ResponseCache
+from .settings_handler import SettingsHandler
+
+# Minimum time between two progress_updated emissions, in seconds.
+PROGRESS_EMIT_INTERVAL = 0.05
+# Most API requests that may be in flight at once; the processing delay still spaces them out.
+MAX_CONCURRENCY = 4
 
 class FileProcessor(QObject):
     """
@@ -17,9 +28,17 @@ class FileProcessor(QObject):
     def __init__(self, settings: dict):
         super().__init__()
         self.settings = settings
-        self.files_to_process = []
         self._is_running = True
-        self._is_paused = False
+        # Set while running, cleared while paused; the worker blocks on it instead of polling.
+        self._resume_event = threading.Event()
+        self._resume_event.set()
+        self._stop_event = threading.Event()
+        # Spacing of API requests across pool threads; see _wait_for_request_slot.
+        self._rate_lock = threading.Lock()
+        self._next_request_time = 0.0
+        self._processing_delay = 0
+        self._created_dirs = set()
+        self._response_cache = None
         self.api_handler = GeminiAPIHandler(api_key=settings.get("api_key"))
 
     @staticmethod
@@ -35,34 +54,73 @@ class FileProcessor(QObject):
             report["warnings"].append("Input path is not a valid folder.")
             return report
 
-        # --- UPDATED: Scan logic to handle subfolders ---
-        for dirpath, dirnames, filenames in os.walk(input_path):
-            if dirpath != input_path:
-                report["subfolders_found"] = True
-
-            # If not processing subfolders, we only care about the top level
-            if not process_subfolders and dirpath != input_path:
-                continue
+        excluded = os.path.normcase(os.path.abspath(output_path)) if output_path else None
+        FileProcessor._scan_tree(input_path, process_subfolders, report, excluded)
 
-            for filename in filenames:
-                report["files_found"] += 1
-                ext = os.path.splitext(filename)[1].lower()
-                report["formats"].add(ext if ext else ".no_extension")
-        # --- END UPDATED ---
-
-        if os.path.isdir(output_path) and any(os.scandir(output_path)):
-            report["output_has_files"] = True
+        if os.path.isdir(output_path):
+            with os.scandir(output_path) as it:
+                report["output_has_files"] = next(it, None) is not None
 
         # --- UPDATED: Warning logic ---
         if report["subfolders_found"] and not process_subfolders:
             report["warnings"].append("• Input folder contains subfolders. They will be ignored. (Enable 'Process Subfolders' to include them).")
         # --- END UPDATED ---
 
-        if len(report["formats"]) > 1: report["warnings"].append(f"• Multiple file formats found: {', '.join(sorted(list(report['formats'])))}.")
+        if len(report["formats"]) > 1: report["warnings"].append(f"• Multiple file formats found: {', '.join(sorted(report['formats']))}.")
         if report["output_has_files"]: report["warnings"].append("• Output folder is not empty. Existing files may be overwritten.")
         if report["files_found"] == 0: report["warnings"].append("• No files found in the input folder.")
         return report
 
+    @staticmethod
+    def _scan_tree(path: str, recurse: bool, report: dict, excluded: str | None = None):
+        """
+        Walks a folder with os.scandir and fills the pre-flight report in place.
+        Only the top level is counted unless recurse is True. The excluded folder
+        (an already normalised output path) is left out, just as run() leaves it out.
+        """
+        try:
+            with os.scandir(path) as it:
+                for entry in it:
+                    if entry.is_dir(follow_symlinks=False):
+                        if os.path.normcase(os.path.abspath(entry.path)) == excluded:
+                            continue
+                        report["subfolders_found"] = True
+                        if recurse:
+                            FileProcessor._scan_tree(entry.path, recurse, report, excluded)
+                    else:
+                        report["files_found"] += 1
+                        ext = os.path.splitext(entry.name)[1].lower()
+                        report["formats"].add(ext if ext else ".no_extension")
+        except OSError:
+            # Unreadable folders are skipped, the same way os.walk does.
+            pass
+
+    @staticmethod
+    def _collect_files(root: str, recurse: bool = False, exclude: str | None = None) -> Iterator[os.DirEntry]:
+        """
+        Yields the files inside root as os.scandir discovers them, descending
+        into subfolders only when recurse is True. The DirEntry objects cache
+        their stat() result, so callers can check file sizes cheaply.
+        A subfolder matching exclude (e.g. an output folder nested inside the
+        input folder) is not descended into.
+        """
+        excluded = os.path.normcase(os.path.abspath(exclude)) if exclude else None
+        pending = deque([root])
+        while pending:
+            current = pending.popleft()
+            try:
+                with os.scandir(current) as it:
+                    for entry in it:
+                        if entry.is_file():
+                            yield entry
+                        elif recurse and entry.is_dir(follow_symlinks=False):
+                            if os.path.normcase(os.path.abspath(entry.path)) != excluded:
+                                pending.append(entry.path)
+            except OSError:
+                # Only a broken root is fatal; unreadable subfolders are skipped like os.walk did.
+                if current == root:
+                    raise
+
     def run(self):
         """The main processing loop that runs in a thread."""
         input_path = self.settings.get("input_path")
@@ -70,11 +128,15 @@ class FileProcessor(QObject):
         system_prompt = self.settings.get("prompt_text")
         model_name = self.settings.get("selected_model_name")
         output_extension = self.settings.get("output_extension", "").strip()
+        if output_extension and not output_extension.startswith('.'):
+            output_extension = '.' + output_extension
         processing_delay = self.settings.get("processing_delay", 1)
         thinking_mode = self.settings.get("thinking_mode", False)
         process_subfolders = self.settings.get("process_subfolders", False) # <-- NEW
+        use_response_cache = self.settings.get("use_response_cache", False)
 
         error_log = []
+        skipped_log = []
         success_count = 0
 
         if not all([input_path, output_path, system_prompt, model_name]):
@@ -95,96 +157,236 @@ class FileProcessor(QObject):
             )
             final_system_prompt = f"{thinking_instruction}\n\n---\n\n{system_prompt}"
 
+        self.api_handler.prepare(final_system_prompt)
+
+        self._response_cache = None
+        if use_response_cache:
+            cache_dir = os.path.join(SettingsHandler().app_config_dir, "response_cache")
+            self._response_cache = ResponseCache(cache_dir, model_name, final_system_prompt)
+
         try:
-            # --- UPDATED: File collection logic ---
-            self.files_to_process = []
-            if process_subfolders:
-                for dirpath, _, filenames in os.walk(input_path):
-                    for filename in filenames:
-                        self.files_to_process.append(os.path.join(dirpath, filename))
-            else:
-                self.files_to_process = [os.path.join(input_path, f) for f in os.listdir(input_path) if os.path.isfile(os.path.join(input_path, f))]
-            # --- END UPDATED ---
+            # Cheap counting pass for the progress bar; the paths themselves are streamed below.
+            # It also notes which folders hold files so the output tree can be created in one go.
+            total_files = 0
+            source_dirs = set()
+            for entry in self._collect_files(input_path, process_subfolders, exclude=output_path):
+                total_files += 1
+                source_dirs.add(os.path.dirname(entry.path))
         except OSError as e:
             self.processing_finished.emit(f"Error reading input folder: {e}", [])
             return
 
-        total_files = len(self.files_to_process)
         if total_files == 0:
             self.processing_finished.emit("Processing finished: No files to process.", [])
             return
 
-        for i, file_path in enumerate(self.files_to_process):
-            if not self._is_running:
-                self.processing_finished.emit("Processing stopped by user.", error_log)
-                return
-            while self._is_paused:
-                time.sleep(0.5)
-                if not self._is_running:
-                    self.processing_finished.emit("Processing stopped by user.", error_log)
-                    return
-
-            original_file_name = os.path.basename(file_path)
-            self.progress_updated.emit(i + 1, total_files, original_file_name)
+        self._created_dirs = set()
+        try:
+            for source_dir in source_dirs:
+                self._ensure_output_dir(os.path.join(output_path, os.path.relpath(source_dir, input_path)))
+        except OSError as e:
+            self.processing_finished.emit(f"Error creating output folder: {e}", [])
+            return
 
+        def record_progress(original_file_name, final=False):
+            nonlocal completed_count, last_progress_emit, last_file_name, emitted_count
+            if not final:
+                completed_count += 1
+                last_file_name = original_file_name
+            # Coalesce progress updates so fast batches don't flood the UI thread's event queue.
+            now = time.monotonic()
+            if final or now - last_progress_emit >= PROGRESS_EMIT_INTERVAL or completed_count >= total_files:
+                last_progress_emit = now
+                # The folder can change between the counting pass and this one; never overshoot the bar.
+                emitted_count = min(completed_count, total_files)
+                self.progress_updated.emit(emitted_count, total_files, last_file_name)
+
+        def record_finished(futures):
+            nonlocal success_count
+            for future in futures:
+                result = future.result()
+                if result is None:
+                    # Cancelled by stop() before its request went out: neither a success nor a failure.
+                    continue
+                original_file_name, error_msg = result
+                if error_msg:
+                    error_log.append(error_msg)
+                else:
+                    success_count += 1
+                record_progress(original_file_name)
+
+        completed_count = 0
+        last_progress_emit = 0.0
+        last_file_name = ""
+        emitted_count = 0
+        in_flight = set()
+        read_error = None
+        self._processing_delay = processing_delay
+        self._next_request_time = 0.0
+
+        with ThreadPoolExecutor(max_workers=MAX_CONCURRENCY) as executor:
             try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    file_content = f.read()
+                for entry in self._collect_files(input_path, process_subfolders, exclude=output_path):
+                    # The timeout only guards against a pause that is never lifted; stop() wakes us right away.
+                    while not self._resume_event.wait(timeout=0.5) and self._is_running:
+                        pass
+                    if not self._is_running:
+                        break
+
+                    # Empty files would only waste a request.
+                    skip_reason = self._get_skip_reason(entry)
+                    if skip_reason:
+                        skip_msg = f"File: {entry.name} | Skipped: {skip_reason}"
+                        print(skip_msg)
+                        skipped_log.append(skip_msg)
+                        record_progress(entry.name)
+                        continue
+
+                    # Keep at most MAX_CONCURRENCY requests in flight at once.
+                    while len(in_flight) >= MAX_CONCURRENCY:
+                        done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                        record_finished(done)
+                    if not self._is_running:
+                        break
+
+                    in_flight.add(executor.submit(
+                        self._process_file, entry.path, input_path, output_path, output_extension
+                    ))
+            except OSError as e:
+                # The input folder went away after the counting pass; let the requests already sent finish.
+                read_error = e
+
+            record_finished(as_completed(in_flight))
+
+        # Always leave the bar on the last count, even if a coalesced update was dropped.
+        if min(completed_count, total_files) != emitted_count:
+            record_progress(last_file_name, final=True)
+
+        if read_error:
+            self.processing_finished.emit(f"Error reading input folder: {read_error}", error_log + skipped_log)
+            return
+
+        if not self._is_running:
+            self.processing_finished.emit("Processing stopped by user.", error_log + skipped_log)
+            return
+
+        summary_message = ""
+        if not error_log and not skipped_log:
+            summary_message = f"Successfully processed {success_count} of {max(total_files, completed_count)} files."
+        else:
+            summary_message = f"Processing finished with issues. \nProcessed: {success_count} | Failed: {len(error_log)}"
+            if skipped_log:
+                summary_message += f" | Skipped: {len(skipped_log)}"
+        self.processing_finished.emit(summary_message, error_log + skipped_log)
+
+    @staticmethod
+    def _get_skip_reason(entry: os.DirEntry) -> str | None:
+        """Returns why a file should not be sent to the API, or None if it should."""
+        try:
+            size = entry.stat().st_size
+        except OSError:
+            # Let the worker try to open it and report the real error.
+            return None
+        if size == 0:
+            return "the file is empty."
+        return None
+
+    def _process_file(self, file_path: str, input_path: str, output_path: str, output_extension: str) -> tuple[str, str | None] | None:
+        """
+        Reads one file, sends it to the API and writes the result. Runs on a pool thread.
 
+        Returns:
+            The file name and an error message, or None if the file was processed successfully.
+            None instead of a tuple if processing was stopped before the request was sent.
+        """
+        original_file_name = os.path.basename(file_path)
+        try:
+            with open(file_path, 'r', encoding='utf-8') as f:
+                file_content = f.read()
+
+            cache_key = None
+            processed_content = None
+            if self._response_cache:
+                cache_key = self._response_cache.key_for(file_content)
+                processed_content = self._response_cache.get(cache_key)
+                if processed_content is not None:
+                    print(f"Using cached response: {original_file_name}")
+
+            if processed_content is None:
+                if not self._wait_for_request_slot():
+                    return None
                 print(f"Sending to API: {original_file_name}")
-                processed_content = self.api_handler.generate_content(
-                    final_system_prompt,
-                    file_content
-                )
+                ok, processed_content = self.api_handler.generate_content(file_content)
 
-                if processed_content.startswith("ERROR:"):
+                if not ok:
                     error_msg = f"File: {original_file_name} | {processed_content}"
                     print(f"API Error: {error_msg}")
-                    error_log.append(error_msg)
-                    continue
+                    return original_file_name, error_msg
 
-                # --- UPDATED: Output path and filename logic ---
-                relative_path = os.path.relpath(file_path, input_path)
-                base_name, original_ext = os.path.splitext(relative_path)
+                if cache_key:
+                    self._response_cache.put(cache_key, processed_content)
 
-                if output_extension:
-                    if not output_extension.startswith('.'):
-                        output_extension = '.' + output_extension
-                    final_relative_path = base_name + output_extension
-                else:
-                    final_relative_path = relative_path
+            # --- UPDATED: Output path and filename logic ---
+            relative_path = os.path.relpath(file_path, input_path)
+            if output_extension:
+                relative_path = os.path.splitext(relative_path)[0] + output_extension
+            output_file_path = os.path.join(output_path, relative_path)
 
-                output_file_path = os.path.join(output_path, final_relative_path)
+            # Usually a set lookup; only folders that appeared after the counting pass hit the disk.
+            self._ensure_output_dir(os.path.dirname(output_file_path))
+            # --- END UPDATED ---
 
-                # Ensure the output directory exists
-                os.makedirs(os.path.dirname(output_file_path), exist_ok=True)
-                # --- END UPDATED ---
+            with open(output_file_path, 'w', encoding='utf-8') as f:
+                f.write(processed_content)
 
-                with open(output_file_path, 'w', encoding='utf-8') as f:
-                    f.write(processed_content)
+            print(f"Successfully saved: {output_file_path}")
+            return original_file_name, None
 
-                print(f"Successfully saved: {output_file_path}")
-                success_count += 1
+        except Exception as e:
+            error_msg = f"File: {original_file_name} | A file system or other critical error occurred: {e}"
+            print(error_msg)
+            return original_file_name, error_msg
 
-            except Exception as e:
-                error_msg = f"File: {original_file_name} | A file system or other critical error occurred: {e}"
-                print(error_msg)
-                error_log.append(error_msg)
-                continue
+    def _wait_for_request_slot(self) -> bool:
+        """
+        Blocks until this thread may send its API request. Requests are spaced by
+        the configured delay so the API's RPM limit is respected no matter how many
+        run in parallel; cache hits never get here, so they don't use up the budget.
 
-            if i < total_files - 1:
-                time.sleep(processing_delay)
+        A paused run holds the request until it is resumed, and only then takes a slot.
 
-        if self._is_running:
-            summary_message = ""
-            if not error_log:
-                summary_message = f"Successfully processed {success_count} of {total_files} files."
-            else:
-                summary_message = f"Processing finished with issues. \nProcessed: {success_count} | Failed: {len(error_log)}"
-            self.processing_finished.emit(summary_message, error_log)
+        Returns:
+            False if processing was stopped while waiting, True otherwise.
+        """
+        while True:
+            # stop() also sets the resume event, so this never outlives a stop.
+            self._resume_event.wait()
+            if self._stop_event.is_set():
+                return False
+            with self._rate_lock:
+                now = time.monotonic()
+                start_time = max(now, self._next_request_time)
+                self._next_request_time = start_time + self._processing_delay
+            if self._stop_event.wait(start_time - now):
+                return False
+            if self._resume_event.is_set():
+                return True
+            # Paused while waiting for the slot: give it up and wait to be resumed again.
+
+    def _ensure_output_dir(self, directory: str):
+        """Creates an output folder unless this run has already done so."""
+        directory = os.path.normpath(directory)
+        if directory not in self._created_dirs:
+            os.makedirs(directory, exist_ok=True)
+            self._created_dirs.add(directory)
 
     def stop(self):
         self._is_running = False
+        self._stop_event.set()
+        self._resume_event.set()
 
     def toggle_pause(self, paused: bool):
-        self._is_paused = paused
\ No newline at end of file
+        if paused:
+            self._resume_event.clear()
+        else:
+            self._resume_event.set()
\ No newline at end of file
@@ -0,0 +1,47 @@
+# app/logic/response_cache.py
+# This file contains an on-disk cache of API responses, so unchanged files are not sent twice.
+
+import os
+import hashlib
+import tempfile
+
+class ResponseCache:
+    """
+    Stores generated text on disk, keyed by a SHA-256 of the model name,
+    the system prompt and the file content. Re-running the same job over
+    unchanged files then skips the API entirely.
+    """
+    def __init__(self, cache_dir: str, model_name: str, system_prompt: str):
+        self.cache_dir = cache_dir
+        # The model and prompt are the same for every file in a run, so they are hashed only once.
+        self._base_hash = hashlib.sha256(model_name.encode('utf-8') + b'\x00' + system_prompt.encode('utf-8') + b'\x00')
+
+    def key_for(self, file_content: str) -> str:
+        """Returns the cache key for a file's content."""
+        file_hash = self._base_hash.copy()
+        file_hash.update(file_content.encode('utf-8'))
+        return file_hash.hexdigest()
+
+    def _path_for(self, key: str) -> str:
+        # Sharded by the first two hex digits to keep folders small.
+        return os.path.join(self.cache_dir, key[:2], f"{key}.txt")
+
+    def get(self, key: str) -> str | None:
+        """Returns the cached response, or None if there is no usable entry."""
+        try:
+            with open(self._path_for(key), 'r', encoding='utf-8') as f:
+                text = f.read()
+        except (OSError, UnicodeDecodeError):
+            return None
+        return text if text else None
+
+    def put(self, key: str, text: str):
+        """Stores a response. Failures are only logged, since the cache is optional."""
+        path = self._path_for(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=os.path.dirname(path), delete=False) as f:
+                f.write(text)
+            os.replace(f.name, path)
+        except OSError as e:
+            print(f"Could not write response cache entry: {e}")
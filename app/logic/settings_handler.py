@@ -3,7 +3,11 @@
 
 import os
 import json
-from PySide6.QtCore import QStandardPaths
+import tempfile
+from PySide6.QtCore import QStandardPaths, QCoreApplication, QTimer
+
+# Rapid saves (e.g. several state changes in a row) are coalesced into one write.
+SAVE_DEBOUNCE_MS = 500
 
 class SettingsHandler:
     """
@@ -15,6 +19,9 @@ class SettingsHandler:
         self.app_config_dir = os.path.join(self.config_path, app_name)
         self.settings_file = os.path.join(self.app_config_dir, "settings.json")
         self._create_config_dir_if_not_exists()
+        self._cache: dict | None = None  # Loaded on first access.
+        self._dirty = False
+        self._save_timer = None
 
     def _create_config_dir_if_not_exists(self):
         """Creates the application's config directory if it's missing."""
@@ -24,7 +31,7 @@ class SettingsHandler:
             except OSError as e:
                 print(f"Error creating config directory: {e}")
 
-    def _load_all_settings(self) -> dict:
+    def _read_settings_file(self) -> dict:
         """Loads the entire settings dictionary from the file."""
         if not os.path.exists(self.settings_file):
             return {}
@@ -35,12 +42,42 @@ class SettingsHandler:
             print(f"Error loading settings file: {e}")
             return {}
 
+    def _load_all_settings(self) -> dict:
+        """Returns the in-memory settings, reading the file only the first time."""
+        if self._cache is None:
+            self._cache = self._read_settings_file()
+        return self._cache
+
     def _save_all_settings(self, settings: dict):
-        """Saves the entire settings dictionary to the file."""
+        """
+        Stores the settings in memory and schedules a write to disk.
+        Without a running Qt application the write happens immediately.
+        """
+        self._cache = settings
+        self._dirty = True
+        if QCoreApplication.instance() is None:
+            self.flush()
+            return
+        if self._save_timer is None:
+            self._save_timer = QTimer()
+            self._save_timer.setSingleShot(True)
+            self._save_timer.setInterval(SAVE_DEBOUNCE_MS)
+            self._save_timer.timeout.connect(self.flush)
+        self._save_timer.start()
+
+    def flush(self):
+        """Writes any pending settings to disk right away."""
+        if self._save_timer is not None:
+            self._save_timer.stop()
+        if not self._dirty:
+            return
         try:
-            with open(self.settings_file, 'w') as f:
-                json.dump(settings, f, indent=4)
-        except IOError as e:
+            # Write to a temp file first so a crash never leaves a half-written settings.json.
+            with tempfile.NamedTemporaryFile('w', dir=self.app_config_dir, delete=False) as f:
+                json.dump(self._cache, f, indent=4)
+            os.replace(f.name, self.settings_file)
+            self._dirty = False
+        except (IOError, OSError) as e:
             print(f"Error saving settings: {e}")
 
     def save_api_key(self, api_key: str):
@@ -67,8 +104,19 @@ class SettingsHandler:
 
     def load_main_window_state(self) -> dict:
         """Loads the state of the main window."""
-        settings = self._load_all_settings()
-        # We don't need to return the api_key here
+        settings = dict(self._load_all_settings())
+        # We don't need to return the api_key or the update check data here
         settings.pop("api_key", None)
+        settings.pop("update_check", None)
         print("Main window state loaded.")
-        return settings
\ No newline at end of file
+        return settings
+
+    def save_update_check(self, url: str, info: dict):
+        """Saves what the last update check of a URL returned (validators and version data)."""
+        settings = self._load_all_settings()
+        settings.setdefault("update_check", {})[url] = info
+        self._save_all_settings(settings)
+
+    def load_update_check(self, url: str) -> dict:
+        """Loads what the last update check of a URL returned. Empty if it was never checked."""
+        return dict(self._load_all_settings().get("update_check", {}).get(url, {}))
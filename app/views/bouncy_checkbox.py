@@ -3,7 +3,7 @@
 
 from PySide6.QtWidgets import QWidget, QHBoxLayout, QLabel
 from PySide6.QtCore import Qt, QPropertyAnimation, QEasingCurve, Property, Signal
-from PySide6.QtGui import QPainter, QColor, QPen, QTransform
+from PySide6.QtGui import QPainter, QColor, QPen, QTransform, QPainterPath, QPixmap
 
 class CheckIndicator(QWidget):
     """The animated, clickable square part of the checkbox."""
@@ -19,6 +19,18 @@ class CheckIndicator(QWidget):
         self.animation.setDuration(150)
         self.animation.setEasingCurve(QEasingCurve.Type.OutBack) # This gives a nice overshoot "bounce"
 
+        # Painting resources are built once instead of on every repaint.
+        self._box_brush_on = QColor("#007bff")
+        self._box_brush_off = QColor("#313341")
+        self._box_pen_off = QPen(QColor("#4f5263"), 2)
+        self._check_pen = QPen(Qt.GlobalColor.white, 2); self._check_pen.setCapStyle(Qt.PenCapStyle.RoundCap); self._check_pen.setJoinStyle(Qt.PenJoinStyle.RoundJoin)
+        # Checkmark geometry, relative to the top-left corner of the box.
+        self._check_path = QPainterPath()
+        self._check_path.moveTo(5, 10); self._check_path.lineTo(9, 14); self._check_path.lineTo(15, 6)
+        # Prerendered idle (scale 1.0) states, created lazily by _idle_pixmap.
+        self._cache_on = None
+        self._cache_off = None
+
     def isChecked(self): return self._checked
 
     def setChecked(self, checked):
@@ -44,29 +56,55 @@ class CheckIndicator(QWidget):
 
     def paintEvent(self, event):
         painter = QPainter(self)
+        # When idle, the indicator always looks the same, so blit a prerendered pixmap.
+        if self._scale == 1.0:
+            painter.drawPixmap(0, 0, self._idle_pixmap())
+            return
+        self._draw_indicator(painter, self._scale)
+
+    def resizeEvent(self, event):
+        self._cache_on = None; self._cache_off = None
+        super().resizeEvent(event)
+
+    def _idle_pixmap(self) -> QPixmap:
+        """Returns the unscaled indicator for the current state, rendering it on first use."""
+        pixmap = self._cache_on if self._checked else self._cache_off
+        ratio = self.devicePixelRatioF()
+        if pixmap is None or pixmap.devicePixelRatio() != ratio:
+            pixmap = QPixmap(self.size() * ratio)
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(Qt.GlobalColor.transparent)
+            pixmap_painter = QPainter(pixmap)
+            self._draw_indicator(pixmap_painter, 1.0)
+            pixmap_painter.end()
+            if self._checked: self._cache_on = pixmap
+            else: self._cache_off = pixmap
+        return pixmap
+
+    def _draw_indicator(self, painter: QPainter, scale: float):
         painter.setRenderHint(QPainter.RenderHint.Antialiasing)
 
         # Apply scale transform
         painter.translate(self.rect().center())
-        painter.scale(self._scale, self._scale)
+        painter.scale(scale, scale)
         painter.translate(-self.rect().center())
 
         # Draw the box
         rect = self.rect().adjusted(1, 1, -1, -1)
         if self._checked:
-            painter.setBrush(QColor("#007bff"))
+            painter.setBrush(self._box_brush_on)
             painter.setPen(Qt.PenStyle.NoPen)
         else:
-            painter.setBrush(QColor("#313341"))
-            painter.setPen(QPen(QColor("#4f5263"), 2))
+            painter.setBrush(self._box_brush_off)
+            painter.setPen(self._box_pen_off)
         painter.drawRoundedRect(rect, 4, 4)
 
         # Draw the checkmark if checked
         if self._checked:
-            pen = QPen(Qt.GlobalColor.white, 2); pen.setCapStyle(Qt.PenCapStyle.RoundCap); pen.setJoinStyle(Qt.PenJoinStyle.RoundJoin)
-            painter.setPen(pen)
-            painter.drawLine(rect.x() + 5, rect.y() + 10, rect.x() + 9, rect.y() + 14)
-            painter.drawLine(rect.x() + 9, rect.y() + 14, rect.x() + 15, rect.y() + 6)
+            painter.setPen(self._check_pen)
+            painter.setBrush(Qt.BrushStyle.NoBrush)
+            painter.translate(rect.topLeft())
+            painter.drawPath(self._check_path)
 
     def get_scale(self): return self._scale
     def set_scale(self, scale): self._scale = scale; self.update()
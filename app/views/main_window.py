@@ -2,14 +2,15 @@
 # This file defines the UI for the main application window.
 
 import os
+from pathlib import Path
 from PySide6.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
     QPushButton, QScrollArea, QFileDialog, QSizePolicy, QSpacerItem,
     QStyle, QFrame, QMessageBox, QTextEdit, QMenu, QComboBox, QProgressBar,
     QSpinBox, QDialog, QDialogButtonBox, QTabWidget
 )
-from PySide6.QtCore import Qt, Signal, QUrl, QThread, QTimer, QSize
-from PySide6.QtGui import QAction, QDesktopServices, QPixmap, QIcon
+from PySide6.QtCore import Qt, Signal, Slot, QUrl, QThread, QTimer, QSize, QRunnable, QThreadPool
+from PySide6.QtGui import QAction, QDesktopServices, QPixmap, QPixmapCache, QIcon, QImage, QFontMetrics
 
 from .bouncy_checkbox import BouncyCheckBox
 from ..logic.file_processor import FileProcessor
@@ -20,9 +21,97 @@ MODEL_HINTS = {
     "flash": {"icon": "⚡️", "category": "Speed & Efficiency"},
     "gemma": {"icon": "⚙️", "category": "Compact & Fast"}
 }
+# Flattened once so the per-model check is a plain tuple walk.
+_MODEL_HINT_LIST = tuple((key, hints["icon"], hints["category"]) for key, hints in MODEL_HINTS.items())
+# Asset locations, resolved once at import.
+_HERE = Path(__file__).resolve().parent
+_ASSETS_ICONS = _HERE.parent.parent / "assets" / "icons"
+_DOCS = _HERE.parent.parent / "docs"
+
+# Parsing the SVG is only worth doing once per process.
+_GIFT_ICON: QIcon | None = None
+
+def _gift_icon() -> QIcon:
+    """Returns the shared donate button icon, loading it on first use."""
+    global _GIFT_ICON
+    if _GIFT_ICON is None:
+        _GIFT_ICON = QIcon(str(_ASSETS_ICONS / "gift.svg"))
+    return _GIFT_ICON
+
 # --- UPDATED: URL for your page ---
 CONTACT_URL = "https://flatpotato22.itch.io/"
 
+# --- Wallet Addresses ---
+# DONE: Replace these placeholder addresses with your actual wallet addresses.
+# (currency, address, display name), shared by every DonationDialog.
+_WALLETS: tuple[tuple[str, str, str], ...] = (
+    ("BTC", "bc1qlaptx3uvyzs83dejakdq647nn82qqwd3t3w97l", "Bitcoin (BTC)"),
+    ("ETH", "0xc395bD0E7e257835b03D62195f08980cCB3bcC27", "Ethereum (ETH)"),
+    ("USDT", "0xc395bD0E7e257835b03D62195f08980cCB3bcC27", "USDT (TRON/TRC-20 Network)"),
+    ("XMR", "87eiGmif2YALvTD73xaEhs8jyrnFWv5zWL9sd8mXUofQaUBpBwKyx96gveptbyzX9cHe2Wxh62ur6LGUiZQwgAR8SJco3HS", "Monero (XMR)"),
+)
+
+# The QR codes never change, so they are decoded once and shared through QPixmapCache.
+# assets/icons ships them prerendered at QR_CODE_SIZE (and @2x for HiDPI screens), so no scaling is needed at runtime.
+QR_CODE_SIZE = 160
+# Filled by _QRDecoder on a pool thread; the GUI thread only reads it.
+_QR_IMAGES: dict[tuple[str, int], QImage] = {}
+_qr_decode_started = False
+
+def _qr_scale(device_pixel_ratio: float) -> int:
+    """Picks the prerendered asset scale for a screen: 2 for any HiDPI ratio, otherwise 1."""
+    return 2 if device_pixel_ratio > 1.0 else 1
+
+def _qr_path(currency: str, scale: int = 1) -> str:
+    return str(_ASSETS_ICONS / f"{currency}_qr_{QR_CODE_SIZE}{'@2x' if scale > 1 else ''}.png")
+
+def _decode_qr(currency: str, scale: int) -> QImage:
+    """Decodes a QR image. QImage is safe to use off the GUI thread, unlike QPixmap."""
+    image = QImage(_qr_path(currency, scale))
+    if image.isNull():
+        # No prerendered asset, so fall back to the full-size original and scale it down.
+        image = QImage(str(_ASSETS_ICONS / f"{currency}_qr.png"))
+        if not image.isNull():
+            image = image.scaled(
+                QR_CODE_SIZE * scale, QR_CODE_SIZE * scale,
+                Qt.AspectRatioMode.KeepAspectRatio,
+                Qt.TransformationMode.SmoothTransformation
+            )
+    image.setDevicePixelRatio(scale)
+    return image
+
+class _QRDecoder(QRunnable):
+    """Decodes every QR code in the background, so opening the donation dialog does not stall on PNG decoding."""
+    def __init__(self, scale: int):
+        super().__init__()
+        self.scale = scale
+
+    def run(self):
+        for currency, _, _ in _WALLETS:
+            _QR_IMAGES[(currency, self.scale)] = _decode_qr(currency, self.scale)
+
+def _start_qr_decoding(scale: int):
+    """Queues the QR decoding once per process."""
+    global _qr_decode_started
+    if not _qr_decode_started:
+        _qr_decode_started = True
+        QThreadPool.globalInstance().start(_QRDecoder(scale))
+
+def _load_qr(currency: str, scale: int) -> QPixmap:
+    """Returns the QR pixmap for a currency at the given scale, loading it on first use. Null if the file is missing."""
+    key = f"flatgem.qr.{currency.lower()}.{QR_CODE_SIZE}{'@2x' if scale > 1 else ''}"
+    pixmap = QPixmap()
+    if not QPixmapCache.find(key, pixmap):
+        image = _QR_IMAGES.get((currency, scale))
+        if image is None:
+            # The background decode has not reached this one yet, so decode it here.
+            image = _decode_qr(currency, scale)
+        pixmap = QPixmap.fromImage(image)
+        if not pixmap.isNull():
+            # Only real images are cached, so a missing file is retried next time.
+            QPixmapCache.insert(key, pixmap)
+    return pixmap
+
 # --- ADDED: Custom ComboBox to ignore wheel events ---
 class NoScrollComboBox(QComboBox):
     """
@@ -53,52 +142,36 @@ class DonationDialog(QDialog):
             "I prefer crypto to avoid taxes and KYC, so 100% of your support goes directly to the creator. Thanks for your support! :D"
         )
         info_label.setWordWrap(True)
-        info_label.setStyleSheet("font-size: 10pt; color: #c5c5d4;")
+        info_label.setObjectName("DonationInfoLabel")
         main_layout.addWidget(info_label)
 
         tab_widget = QTabWidget()
         main_layout.addWidget(tab_widget)
 
-        # --- Wallet Addresses ---
-        # DONE: Replace these placeholder addresses with your actual wallet addresses.
-        wallets = {
-            "BTC": ("bc1qlaptx3uvyzs83dejakdq647nn82qqwd3t3w97l", "Bitcoin (BTC)"),
-            "ETH": ("0xc395bD0E7e257835b03D62195f08980cCB3bcC27", "Ethereum (ETH)"),
-            "USDT": ("0xc395bD0E7e257835b03D62195f08980cCB3bcC27", "USDT (TRON/TRC-20 Network)"),
-            "XMR": ("87eiGmif2YALvTD73xaEhs8jyrnFWv5zWL9sd8mXUofQaUBpBwKyx96gveptbyzX9cHe2Wxh62ur6LGUiZQwgAR8SJco3HS", "Monero (XMR)")
-        }
-
-        for currency, (address, name) in wallets.items():
-            script_dir = os.path.dirname(os.path.abspath(__file__))
-            qr_path = os.path.join(script_dir, "..", "..", "assets", "icons", f"{currency.lower()}_qr.png")
-
-            tab = self.create_crypto_tab(name, address, qr_path)
+        for currency, address, name in _WALLETS:
+            tab = self.create_crypto_tab(currency, name, address)
             tab_widget.addTab(tab, currency)
 
         close_button = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
         close_button.rejected.connect(self.reject)
         main_layout.addWidget(close_button)
 
-    def create_crypto_tab(self, name: str, address: str, qr_code_path: str) -> QWidget:
+    def create_crypto_tab(self, currency: str, name: str, address: str) -> QWidget:
         tab_widget = QWidget()
         layout = QHBoxLayout(tab_widget)
         layout.setSpacing(20)
 
         # QR Code
         qr_label = QLabel()
-        qr_label.setFixedSize(160, 160)
+        qr_label.setFixedSize(QR_CODE_SIZE, QR_CODE_SIZE)
         qr_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        pixmap = QPixmap(qr_code_path)
+        pixmap = _load_qr(currency, _qr_scale(qr_label.devicePixelRatioF()))
         if pixmap.isNull():
             qr_label.setText(f"QR Code for\n{name}\nnot found.")
-            qr_label.setStyleSheet("border: 1px dashed #4f5263; border-radius: 8px;")
-            print(f"Warning: QR Code image not found at '{qr_code_path}'")
+            qr_label.setObjectName("QRPlaceholder")
+            print(f"Warning: QR Code image not found at '{_qr_path(currency)}'")
         else:
-            qr_label.setPixmap(pixmap.scaled(
-                qr_label.size(),
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.FastTransformation
-            ))
+            qr_label.setPixmap(pixmap)
         layout.addWidget(qr_label)
 
         # Address Info
@@ -109,7 +182,7 @@ class DonationDialog(QDialog):
 
         address_edit = QLineEdit(address)
         address_edit.setReadOnly(True)
-        address_edit.setStyleSheet("font-size: 10pt;")
+        address_edit.setObjectName("AddressLineEdit")
 
         copy_button = QPushButton("Copy Address")
         copy_button.clicked.connect(lambda: self.copy_to_clipboard(address, copy_button))
@@ -129,6 +202,8 @@ class DonationDialog(QDialog):
         QTimer.singleShot(2000, lambda: button.setText("Copy Address"))
 
 
+MAX_ERROR_ENTRY_CHARS = 4096
+
 class ErrorLogDialog(QDialog):
     def __init__(self, errors: list[str], parent=None):
         super().__init__(parent)
@@ -138,11 +213,14 @@ class ErrorLogDialog(QDialog):
         layout = QVBoxLayout(self)
 
         info_label = QLabel("The following errors occurred during processing:")
-        info_label.setStyleSheet("font-weight: bold;")
+        info_label.setObjectName("ErrorLogInfoLabel")
 
         self.log_view = QTextEdit()
         self.log_view.setReadOnly(True)
-        self.log_view.setText("\n\n".join(errors))
+        # Plain text with no wrapping keeps layout cheap for long logs.
+        self.log_view.setAcceptRichText(False)
+        self.log_view.setLineWrapMode(QTextEdit.LineWrapMode.NoWrap)
+        self.set_errors(errors)
 
         button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
         button_box.rejected.connect(self.reject)
@@ -151,42 +229,70 @@ class ErrorLogDialog(QDialog):
         layout.addWidget(self.log_view)
         layout.addWidget(button_box)
 
-        self.log_view.setStyleSheet("background-color: #21232c; border: 1px solid #4f5263; padding: 8px; border-radius: 8px; color: #e6e7f0;")
+        self.log_view.setObjectName("ErrorLog")
+
+    def set_errors(self, errors: list[str]):
+        """Replaces the shown errors, so one dialog can be reused across runs."""
+        # Very long entries (e.g. a whole API error payload) are cropped.
+        cropped = [e if len(e) <= MAX_ERROR_ENTRY_CHARS else e[:MAX_ERROR_ENTRY_CHARS] + " […]" for e in errors]
+        self.log_view.setPlainText("\n\n".join(cropped))
 
 
 class MainWindow(QMainWindow):
     change_api_key_requested = Signal()
     closing = Signal(dict)
+    # Contents of docs/prompt_tips.txt, read on the first click and shared afterwards.
+    _tips_text: str | None = None
 
     def __init__(self, models_list: list[str] = None, saved_state: dict = None):
         super().__init__()
+        # Build and restore the whole widget tree with updates off, so it lays out and paints once.
+        self.setUpdatesEnabled(False)
         self.setWindowTitle("FlatGem")
         self.resize(800, 650)
 
         self.processing_thread = None
         self.file_processor = None
         self.api_key = None
-
-        scroll_area = QScrollArea(); scroll_area.setWidgetResizable(True); scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff); self.setCentralWidget(scroll_area)
-        main_widget = QWidget(); scroll_area.setWidget(main_widget)
-        main_layout = QVBoxLayout(main_widget); main_layout.setContentsMargins(20, 15, 20, 15); main_layout.setSpacing(15)
+        # Dialogs are built on first use and then reused.
+        self._donation_dialog = None
+        self._error_log_dialog = None
+        # Combo display text per model name, reused when the list is repopulated.
+        self._display_cache: dict[str, str] = {}
+
+        scroll_area = QScrollArea()
+        scroll_area.setWidgetResizable(True)
+        scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
+        self.setCentralWidget(scroll_area)
+        main_widget = QWidget()
+        scroll_area.setWidget(main_widget)
+        # The resizable main_widget always covers the whole viewport and paints its own styled background,
+        # so the viewport can skip erasing itself on every scroll step.
+        scroll_area.viewport().setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent, True)
+        main_layout = QVBoxLayout(main_widget)
+        main_layout.setContentsMargins(20, 15, 20, 15)
+        main_layout.setSpacing(15)
 
         # --- PROMPT SECTION ---
-        prompt_title = QLabel("System Prompt"); prompt_title.setStyleSheet("font-size: 13pt; font-weight: bold;")
-        self.prompt_edit = QTextEdit(); self.prompt_edit.setPlaceholderText("Enter your detailed instructions for the AI here. The quality and detail of the system prompt directly influence the quality of the output. Before processing all the files, first process one or two files as a test. Wait for confirmation that the output is correct before proceeding with the rest. This ensures the AI has correctly understood the task. I also recommend that you ask the AI not to use Markdown formatting in its output."); self.prompt_edit.setMinimumHeight(150)
+        prompt_title = QLabel("System Prompt")
+        prompt_title.setObjectName("SectionTitle")
+        self.prompt_edit = QTextEdit()
+        self.prompt_edit.setPlaceholderText("Enter your detailed instructions for the AI here. The quality and detail of the system prompt directly influence the quality of the output. Before processing all the files, first process one or two files as a test. Wait for confirmation that the output is correct before proceeding with the rest. This ensures the AI has correctly understood the task. I also recommend that you ask the AI not to use Markdown formatting in its output.")
+        self.prompt_edit.setMinimumHeight(150)
 
         prompt_buttons_layout = QHBoxLayout()
-        self.generate_btn = QPushButton("Generate with AI"); self.generate_btn.setObjectName("UtilityButton")
-        self.tips_btn = QPushButton("Prompting Tips"); self.tips_btn.setObjectName("UtilityButton")
+        self.generate_btn = QPushButton("Generate with AI")
+        self.generate_btn.setObjectName("UtilityButton")
+        self.tips_btn = QPushButton("Prompting Tips")
+        self.tips_btn.setObjectName("UtilityButton")
 
-        self.about_btn = QPushButton("About FlatPotato"); self.about_btn.setObjectName("UtilityButton")
+        self.about_btn = QPushButton("About FlatPotato")
+        self.about_btn.setObjectName("UtilityButton")
 
         # --- FIX: Use the new StaticIconButton ---
         self.donate_btn = StaticIconButton("Donate")
         self.donate_btn.setObjectName("DonateButton") # Set object name for QSS
-        script_dir = os.path.dirname(__file__)
-        icon_path = os.path.join(script_dir, '..', '..', 'assets', 'icons', 'gift.svg')
-        self.donate_btn.setIcon(QIcon(icon_path))
+        self.donate_btn.setIcon(_gift_icon())
         self.donate_btn.setIconSize(QSize(16, 16))
         # --- END FIX ---
 
@@ -201,30 +307,59 @@ class MainWindow(QMainWindow):
         self.about_btn.clicked.connect(self.open_about_page)
         self.donate_btn.clicked.connect(self.open_donation_dialog)
 
-        main_layout.addWidget(prompt_title)
-        main_layout.addWidget(self.prompt_edit)
-        main_layout.addLayout(prompt_buttons_layout)
+        # Settings live in two containers, so disabling a container greys out every control in it at once.
+        self.prompt_container = QWidget()
+        prompt_layout = QVBoxLayout(self.prompt_container)
+        prompt_layout.setContentsMargins(0, 0, 0, 0)
+        prompt_layout.setSpacing(15)
+        prompt_layout.addWidget(prompt_title)
+        prompt_layout.addWidget(self.prompt_edit)
+        prompt_layout.addLayout(prompt_buttons_layout)
+        main_layout.addWidget(self.prompt_container)
 
         # --- PROCESSING CONTROLS ---
-        self.start_button = QPushButton("Start Processing"); self.start_button.setObjectName("PrimaryButton")
-        self.pause_button = QPushButton("Pause"); self.pause_button.setVisible(False); self.pause_button.setCheckable(True)
-        self.stop_button = QPushButton("Stop"); self.stop_button.setVisible(False); self.stop_button.setObjectName("StopButton")
-        processing_buttons_layout = QHBoxLayout(); processing_buttons_layout.addStretch(); processing_buttons_layout.addWidget(self.start_button); processing_buttons_layout.addWidget(self.pause_button); processing_buttons_layout.addWidget(self.stop_button)
-
-        self.progress_widget = QWidget(); self.progress_widget.setVisible(False)
-        progress_layout = QVBoxLayout(self.progress_widget); progress_layout.setContentsMargins(0, 10, 0, 0)
-        self.progress_label = QLabel("Processed 0 of 0 files"); self.progress_bar = QProgressBar(); self.progress_bar.setTextVisible(False)
-        self.current_file_label = QLabel("Currently processing: -"); self.current_file_label.setStyleSheet("font-size: 9pt; color: #c5c5d4;")
-        progress_layout.addWidget(self.progress_label); progress_layout.addWidget(self.progress_bar); progress_layout.addWidget(self.current_file_label)
+        self.start_button = QPushButton("Start Processing")
+        self.start_button.setObjectName("PrimaryButton")
+        self.pause_button = QPushButton("Pause")
+        self.pause_button.setVisible(False)
+        self.pause_button.setCheckable(True)
+        self.stop_button = QPushButton("Stop")
+        self.stop_button.setVisible(False)
+        self.stop_button.setObjectName("StopButton")
+        processing_buttons_layout = QHBoxLayout()
+        processing_buttons_layout.addStretch()
+        processing_buttons_layout.addWidget(self.start_button)
+        processing_buttons_layout.addWidget(self.pause_button)
+        processing_buttons_layout.addWidget(self.stop_button)
+
+        self.progress_widget = QWidget()
+        self.progress_widget.setVisible(False)
+        progress_layout = QVBoxLayout(self.progress_widget)
+        progress_layout.setContentsMargins(0, 10, 0, 0)
+        self.progress_label = QLabel("Processed 0 of 0 files")
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setTextVisible(False)
+        self.current_file_label = QLabel("Currently processing: -")
+        self.current_file_label.setObjectName("DescLabel")
+        progress_layout.addWidget(self.progress_label)
+        progress_layout.addWidget(self.progress_bar)
+        progress_layout.addWidget(self.current_file_label)
 
         main_layout.addLayout(processing_buttons_layout)
         main_layout.addWidget(self.progress_widget)
         main_layout.addWidget(self.create_separator())
 
+        # Everything below the processing controls, down to the bottom buttons.
+        self.settings_container = QWidget()
+        settings_layout = QVBoxLayout(self.settings_container)
+        settings_layout.setContentsMargins(0, 0, 0, 0)
+        settings_layout.setSpacing(15)
+
         # --- PROCESSING SETTINGS SECTION ---
-        processing_settings_title = QLabel("Processing Settings"); processing_settings_title.setStyleSheet("font-size: 13pt; font-weight: bold;")
-        main_layout.addWidget(processing_settings_title)
-        main_layout.addSpacing(5)
+        processing_settings_title = QLabel("Processing Settings")
+        processing_settings_title.setObjectName("SectionTitle")
+        settings_layout.addWidget(processing_settings_title)
+        settings_layout.addSpacing(5)
 
         ext_layout = QHBoxLayout()
         output_ext_label = QLabel("Output File Extension")
@@ -234,68 +369,164 @@ class MainWindow(QMainWindow):
         ext_layout.addWidget(output_ext_label)
         ext_layout.addWidget(self.output_ext_edit)
         ext_layout.addStretch()
-        main_layout.addLayout(ext_layout)
+        settings_layout.addLayout(ext_layout)
 
         output_ext_desc = QLabel("Leave empty to keep original extension. Ensure your prompt instructs the AI to generate content in the correct format.")
-        output_ext_desc.setStyleSheet("color: #c5c5d4; font-size: 9pt;"); output_ext_desc.setWordWrap(True)
-        main_layout.addWidget(output_ext_desc); main_layout.addSpacing(15)
+        output_ext_desc.setObjectName("DescLabel")
+        output_ext_desc.setWordWrap(True)
+        settings_layout.addWidget(output_ext_desc)
+        settings_layout.addSpacing(15)
 
         delay_layout = QHBoxLayout()
         delay_label = QLabel("Delay Between Files (seconds)")
         self.delay_spinbox = QSpinBox()
-        self.delay_spinbox.setRange(0, 300); self.delay_spinbox.setValue(10); self.delay_spinbox.setButtonSymbols(QSpinBox.ButtonSymbols.NoButtons); self.delay_spinbox.setSuffix(" s")
+        self.delay_spinbox.setRange(0, 300)
+        self.delay_spinbox.setValue(10)
+        self.delay_spinbox.setButtonSymbols(QSpinBox.ButtonSymbols.NoButtons)
+        self.delay_spinbox.setSuffix(" s")
         self.delay_spinbox.setFixedWidth(150)
         delay_layout.addWidget(delay_label)
         delay_layout.addWidget(self.delay_spinbox)
         delay_layout.addStretch()
-        main_layout.addLayout(delay_layout)
+        settings_layout.addLayout(delay_layout)
 
         delay_desc = QLabel("Google's API has a requests per minute (RPM) limit. A delay prevents errors on the free plan. Recommended: 10s for large batches.")
-        delay_desc.setStyleSheet("color: #c5c5d4; font-size: 9pt;"); delay_desc.setWordWrap(True)
-        main_layout.addWidget(delay_desc)
-        main_layout.addSpacing(15)
+        delay_desc.setObjectName("DescLabel")
+        delay_desc.setWordWrap(True)
+        settings_layout.addWidget(delay_desc)
+        settings_layout.addSpacing(15)
 
         self.subfolders_checkbox = BouncyCheckBox("Process Subfolders")
-        main_layout.addWidget(self.subfolders_checkbox)
+        settings_layout.addWidget(self.subfolders_checkbox)
         subfolders_desc = QLabel("If checked, the application will recursively scan the input folder and recreate the folder structure in the output directory.")
-        subfolders_desc.setStyleSheet("color: #c5c5d4; font-size: 9pt;"); subfolders_desc.setWordWrap(True)
-        main_layout.addWidget(subfolders_desc)
+        subfolders_desc.setObjectName("DescLabel")
+        subfolders_desc.setWordWrap(True)
+        settings_layout.addWidget(subfolders_desc)
+        settings_layout.addSpacing(15)
 
-        main_layout.addWidget(self.create_separator())
+        self.response_cache_checkbox = BouncyCheckBox("Reuse Cached Responses")
+        settings_layout.addWidget(self.response_cache_checkbox)
+        response_cache_desc = QLabel("If checked, files whose content, prompt and model haven't changed since a previous run reuse the saved AI response instead of calling the API again.")
+        response_cache_desc.setObjectName("DescLabel")
+        response_cache_desc.setWordWrap(True)
+        settings_layout.addWidget(response_cache_desc)
+
+        settings_layout.addWidget(self.create_separator())
 
         # --- FOLDER SETTINGS ---
-        folder_title = QLabel("Folder Settings"); folder_title.setStyleSheet("font-size: 13pt; font-weight: bold;"); main_layout.addWidget(folder_title)
-        input_label = QLabel("Select the folder with files to process."); self.input_path_edit = QLineEdit(); self.input_path_edit.setPlaceholderText("e.g., C:/Users/YourName/Documents/Project/Input_Folder"); self.input_browse_btn = QPushButton(); self.input_browse_btn.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_DirIcon)); self.input_browse_btn.clicked.connect(self.browse_for_input_folder); input_layout = QHBoxLayout(); input_layout.addWidget(self.input_path_edit); input_layout.addWidget(self.input_browse_btn); output_label = QLabel("Select a folder to save processed files."); self.output_path_edit = QLineEdit(); self.output_path_edit.setPlaceholderText("e.g., C:/Users/YourName/Documents/Project/Output_Folder"); self.output_browse_btn = QPushButton(); self.output_browse_btn.setIcon(self.style().standardIcon(QStyle.StandardPixmap.SP_DirIcon)); self.output_browse_btn.clicked.connect(self.browse_for_output_folder); output_layout = QHBoxLayout(); output_layout.addWidget(self.output_path_edit); output_layout.addWidget(self.output_browse_btn); main_layout.addWidget(input_label); main_layout.addLayout(input_layout); main_layout.addSpacing(10); main_layout.addWidget(output_label); main_layout.addLayout(output_layout); main_layout.addWidget(self.create_separator());
+        folder_title = QLabel("Folder Settings")
+        folder_title.setObjectName("SectionTitle")
+        settings_layout.addWidget(folder_title)
+        dir_icon = self.style().standardIcon(QStyle.StandardPixmap.SP_DirIcon)
+
+        input_label = QLabel("Select the folder with files to process.")
+        self.input_path_edit = QLineEdit()
+        self.input_path_edit.setPlaceholderText("e.g., C:/Users/YourName/Documents/Project/Input_Folder")
+        self.input_browse_btn = QPushButton()
+        self.input_browse_btn.setIcon(dir_icon)
+        self.input_browse_btn.clicked.connect(self.browse_for_input_folder)
+        input_layout = QHBoxLayout()
+        input_layout.addWidget(self.input_path_edit)
+        input_layout.addWidget(self.input_browse_btn)
+
+        output_label = QLabel("Select a folder to save processed files.")
+        self.output_path_edit = QLineEdit()
+        self.output_path_edit.setPlaceholderText("e.g., C:/Users/YourName/Documents/Project/Output_Folder")
+        self.output_browse_btn = QPushButton()
+        self.output_browse_btn.setIcon(dir_icon)
+        self.output_browse_btn.clicked.connect(self.browse_for_output_folder)
+        output_layout = QHBoxLayout()
+        output_layout.addWidget(self.output_path_edit)
+        output_layout.addWidget(self.output_browse_btn)
+
+        settings_layout.addWidget(input_label)
+        settings_layout.addLayout(input_layout)
+        settings_layout.addSpacing(10)
+        settings_layout.addWidget(output_label)
+        settings_layout.addLayout(output_layout)
+        settings_layout.addWidget(self.create_separator())
 
         # --- MODEL SETTINGS ---
-        model_title = QLabel("Model Settings"); model_title.setStyleSheet("font-size: 13pt; font-weight: bold;"); main_layout.addWidget(model_title)
-        model_label = QLabel("Choose the AI model.");
+        model_title = QLabel("Model Settings")
+        model_title.setObjectName("SectionTitle")
+        settings_layout.addWidget(model_title)
+        model_label = QLabel("Choose the AI model.")
 
         self.model_combo = NoScrollComboBox()
 
-        self.populate_models_combo(models_list if models_list else []);
-        main_layout.addWidget(model_label); main_layout.addWidget(self.model_combo)
-        model_desc = QLabel("I recommend using the gemini-2.5-flash model. It's free and works well. Be careful, some models on this list might behave strangely. \nWhen selecting a Gemini model, consider its specific strengths and API limits. A less capable model may not perform your task adequately, while a more powerful one could quickly deplete your daily API quota."); model_desc.setStyleSheet("color: #c5c5d4; font-size: 9pt;"); model_desc.setWordWrap(True); main_layout.addWidget(model_desc)
-        model_link_label = QLabel('<a href="https://ai.google.dev/models/gemini" style="color: #009cff;">Learn about models...</a>'); model_link_label.setOpenExternalLinks(True); main_layout.addSpacing(4); main_layout.addWidget(model_link_label); main_layout.addSpacing(15);
-        self.thinking_mode_checkbox = BouncyCheckBox("Thinking Mode"); thinking_desc = QLabel("Allows the model to perform more complex reasoning before giving an answer."); thinking_desc.setStyleSheet("color: #c5c5d4; font-size: 9pt;"); thinking_desc.setWordWrap(True); main_layout.addWidget(self.thinking_mode_checkbox); main_layout.addWidget(thinking_desc); main_layout.addSpacing(10);
-        main_layout.addStretch();
+        self.populate_models_combo(models_list if models_list else [])
+        settings_layout.addWidget(model_label)
+        settings_layout.addWidget(self.model_combo)
+        model_desc = QLabel("I recommend using the gemini-2.5-flash model. It's free and works well. Be careful, some models on this list might behave strangely. \nWhen selecting a Gemini model, consider its specific strengths and API limits. A less capable model may not perform your task adequately, while a more powerful one could quickly deplete your daily API quota.")
+        model_desc.setObjectName("DescLabel")
+        model_desc.setWordWrap(True)
+        settings_layout.addWidget(model_desc)
+        model_link_label = QLabel('<a href="https://ai.google.dev/models/gemini" style="color: #009cff;">Learn about models...</a>')
+        model_link_label.setOpenExternalLinks(True)
+        settings_layout.addSpacing(4)
+        settings_layout.addWidget(model_link_label)
+        settings_layout.addSpacing(15)
+
+        self.thinking_mode_checkbox = BouncyCheckBox("Thinking Mode")
+        thinking_desc = QLabel("Allows the model to perform more complex reasoning before giving an answer.")
+        thinking_desc.setObjectName("DescLabel")
+        thinking_desc.setWordWrap(True)
+        settings_layout.addWidget(self.thinking_mode_checkbox)
+        settings_layout.addWidget(thinking_desc)
+        settings_layout.addSpacing(10)
+        settings_layout.addStretch()
 
         # --- BOTTOM BUTTONS ---
-        bottom_button_layout = QHBoxLayout(); self.change_api_key_btn = QPushButton("Change API Key"); self.change_api_key_btn.clicked.connect(self.change_api_key_requested); self.reset_settings_btn = QPushButton("Reset Settings"); self.reset_settings_btn.clicked.connect(self.confirm_reset_settings); bottom_button_layout.addWidget(self.change_api_key_btn); bottom_button_layout.addWidget(self.reset_settings_btn); bottom_button_layout.addStretch(); main_layout.addLayout(bottom_button_layout)
-
-        self.settings_widgets = [self.prompt_edit, self.generate_btn, self.tips_btn, self.about_btn, self.donate_btn, self.output_ext_edit, self.delay_spinbox, self.subfolders_checkbox, self.input_path_edit, self.output_path_edit, self.input_browse_btn, self.output_browse_btn, self.model_combo, self.thinking_mode_checkbox, self.change_api_key_btn, self.reset_settings_btn]
-
-        self.start_button.clicked.connect(self.start_processing_confirmation); self.stop_button.clicked.connect(self.stop_processing); self.pause_button.toggled.connect(self.toggle_pause_processing); self.input_path_edit.textChanged.connect(self._update_start_button_state); self.output_path_edit.textChanged.connect(self._update_start_button_state); self.prompt_edit.textChanged.connect(self._update_start_button_state)
-        self._update_start_button_state()
+        self.change_api_key_btn = QPushButton("Change API Key")
+        self.change_api_key_btn.clicked.connect(self.change_api_key_requested)
+        self.reset_settings_btn = QPushButton("Reset Settings")
+        self.reset_settings_btn.clicked.connect(self.confirm_reset_settings)
+        bottom_button_layout = QHBoxLayout()
+        bottom_button_layout.addWidget(self.change_api_key_btn)
+        bottom_button_layout.addWidget(self.reset_settings_btn)
+        bottom_button_layout.addStretch()
+        settings_layout.addLayout(bottom_button_layout)
+        main_layout.addWidget(self.settings_container, 1)
+
+        self.start_button.clicked.connect(self.start_processing_confirmation)
+        self.stop_button.clicked.connect(self.stop_processing)
+        self.pause_button.toggled.connect(self.toggle_pause_processing)
+        self.input_path_edit.textChanged.connect(self._on_input_path_changed)
+        self.output_path_edit.textChanged.connect(self._on_output_path_changed)
+        # The prompt can be long, so its check is debounced instead of running on every keystroke.
+        self._prompt_check_timer = QTimer(self)
+        self._prompt_check_timer.setSingleShot(True)
+        self._prompt_check_timer.setInterval(150)
+        self._prompt_check_timer.timeout.connect(self._on_prompt_changed)
+        self.prompt_edit.textChanged.connect(self._prompt_check_timer.start)
+        # Progress signals only record the latest values; this timer paints them at about 30 Hz.
+        self._latest_progress = None
+        self._shown_progress = None
+        self._progress_fm = None
+        self._progress_timer = QTimer(self)
+        self._progress_timer.setInterval(33)
+        self._progress_timer.timeout.connect(self._apply_progress)
+        # Each field keeps its own "ready" flag, so a change only re-reads the field that changed.
+        self._input_ready = False
+        self._output_ready = False
+        self._prompt_ready = False
+        self._on_prompt_changed()
         if saved_state: self.apply_state(saved_state)
+        self.setUpdatesEnabled(True)
+        # Decode the donation QR codes while the user is busy with the main window.
+        _start_qr_decoding(_qr_scale(self.devicePixelRatioF()))
 
+    @Slot()
     def open_donation_dialog(self):
-        dialog = DonationDialog(self)
-        dialog.exec()
+        if self._donation_dialog is None:
+            self._donation_dialog = DonationDialog(self)
+        self._donation_dialog.exec()
 
+    @Slot()
     def open_about_page(self):
         QDesktopServices.openUrl(QUrl(CONTACT_URL))
 
+    @Slot()
     def start_processing_confirmation(self):
         input_path = self.input_path_edit.text(); output_path = self.output_path_edit.text()
         if input_path and output_path:
@@ -316,23 +547,47 @@ class MainWindow(QMainWindow):
         settings = self.get_current_state(); settings["api_key"] = self.api_key
         self.file_processor = FileProcessor(settings)
         self.processing_thread = QThread(); self.file_processor.moveToThread(self.processing_thread)
-        self.file_processor.progress_updated.connect(self.update_progress)
-        self.file_processor.processing_finished.connect(self.on_processing_finished)
-        self.processing_thread.started.connect(self.file_processor.run)
+        # Worker signals always cross into the GUI thread, so they are queued explicitly.
+        self.file_processor.progress_updated.connect(self._on_progress, Qt.ConnectionType.QueuedConnection)
+        self.file_processor.processing_finished.connect(self.on_processing_finished, Qt.ConnectionType.QueuedConnection)
+        # started is emitted from the new thread, which is where file_processor now lives.
+        self.processing_thread.started.connect(self.file_processor.run, Qt.ConnectionType.DirectConnection)
+        # The metrics are taken from the polished label on the first update of each run.
+        self._latest_progress = None; self._shown_progress = None; self._progress_fm = None; self._progress_timer.start()
         self.processing_thread.start()
 
+    @Slot()
     def stop_processing(self):
         if self.file_processor: self.file_processor.stop()
         if self.processing_thread: self.processing_thread.quit(); self.processing_thread.wait()
+        self._progress_timer.stop()
         self._set_controls_enabled(True); self.start_button.setVisible(True); self.pause_button.setVisible(False); self.pause_button.setChecked(False); self.stop_button.setVisible(False); self.progress_widget.setVisible(False)
 
+    @Slot(bool)
     def toggle_pause_processing(self, paused):
         if self.file_processor: self.file_processor.toggle_pause(paused)
         self.pause_button.setText("Resume" if paused else "Pause")
 
+    @Slot(int, int, str)
+    def _on_progress(self, current, total, filename):
+        """Stores the latest progress; the widgets are updated by _progress_timer."""
+        self._latest_progress = (current, total, filename)
+
+    @Slot()
+    def _apply_progress(self):
+        progress = self._latest_progress
+        if progress is None or progress == self._shown_progress: return
+        self._shown_progress = progress
+        self.update_progress(*progress)
+
     def update_progress(self, current, total, filename):
-        self.progress_bar.setMaximum(total); self.progress_bar.setValue(current); self.progress_label.setText(f"Processed {current} of {total} files"); self.current_file_label.setText(f"Current: {filename}")
+        if total != self.progress_bar.maximum(): self.progress_bar.setMaximum(total)
+        self.progress_bar.setValue(current); self.progress_label.setText(f"Processed {current} of {total} files")
+        # Deeply nested paths can be very long, so the middle is elided to fit the label.
+        if self._progress_fm is None: self._progress_fm = QFontMetrics(self.current_file_label.font())
+        self.current_file_label.setText(self._progress_fm.elidedText(f"Current: {filename}", Qt.TextElideMode.ElideMiddle, self.current_file_label.width()))
 
+    @Slot(str, list)
     def on_processing_finished(self, message: str, errors: list):
         self.stop_processing()
         msg_box = QMessageBox(self)
@@ -344,7 +599,9 @@ class MainWindow(QMainWindow):
             msg_box.addButton(QMessageBox.StandardButton.Ok)
             msg_box.exec()
             if msg_box.clickedButton() == show_details_btn:
-                error_dialog = ErrorLogDialog(errors, self); error_dialog.exec()
+                if self._error_log_dialog is None: self._error_log_dialog = ErrorLogDialog(errors, self)
+                else: self._error_log_dialog.set_errors(errors)
+                self._error_log_dialog.exec()
         else:
             msg_box.setIcon(QMessageBox.Icon.Information); msg_box.exec()
 
@@ -357,74 +614,107 @@ class MainWindow(QMainWindow):
             "prompt_text": self.prompt_edit.toPlainText(), "input_path": self.input_path_edit.text(), "output_path": self.output_path_edit.text(),
             "output_extension": self.output_ext_edit.text(), "processing_delay": self.delay_spinbox.value(), "selected_model_display": selected_model_text,
             "selected_model_name": selected_model_data, "thinking_mode": self.thinking_mode_checkbox.isChecked(), "process_subfolders": self.subfolders_checkbox.isChecked(),
+            "use_response_cache": self.response_cache_checkbox.isChecked(),
         }
         return state
 
     def apply_state(self, state):
+        updates_were_enabled = self.updatesEnabled(); self.setUpdatesEnabled(False)
         self.prompt_edit.setPlainText(state.get("prompt_text", "")); self.input_path_edit.setText(state.get("input_path", "")); self.output_path_edit.setText(state.get("output_path", ""))
         self.output_ext_edit.setText(state.get("output_extension", "")); self.delay_spinbox.setValue(state.get("processing_delay", 10)); self.thinking_mode_checkbox.setChecked(state.get("thinking_mode", False));
-        self.subfolders_checkbox.setChecked(state.get("process_subfolders", False))
+        self.subfolders_checkbox.setChecked(state.get("process_subfolders", False)); self.response_cache_checkbox.setChecked(state.get("use_response_cache", False))
         model_to_select = state.get("selected_model_display", "")
         if model_to_select:
-            for i in range(self.model_combo.count()):
-                if self.model_combo.itemText(i) == model_to_select: self.model_combo.setCurrentIndex(i); break
+            index = self._display_to_index.get(model_to_select)
+            if index is not None: self.model_combo.setCurrentIndex(index)
+        self.setUpdatesEnabled(updates_were_enabled)
         print("Saved state applied to main window.")
 
     def closeEvent(self, event):
         print("Main window is closing, emitting state."); current_state = self.get_current_state(); self.closing.emit(current_state); event.accept()
 
+    @Slot()
     def open_ai_studio(self): QDesktopServices.openUrl(QUrl("https://aistudio.google.com/prompts/new_chat"))
 
     def _set_controls_enabled(self, enabled):
-        for widget in self.settings_widgets: widget.setEnabled(enabled)
+        self.prompt_container.setEnabled(enabled); self.settings_container.setEnabled(enabled)
+
+    @Slot(str)
+    def _on_input_path_changed(self, text: str):
+        self._input_ready = bool(text.strip()); self._refresh_start_enabled()
 
-    def _update_start_button_state(self):
-        is_ready = bool(self.input_path_edit.text().strip() and self.output_path_edit.text().strip() and self.prompt_edit.toPlainText().strip()); self.start_button.setEnabled(is_ready)
+    @Slot(str)
+    def _on_output_path_changed(self, text: str):
+        self._output_ready = bool(text.strip()); self._refresh_start_enabled()
+
+    @Slot()
+    def _on_prompt_changed(self):
+        # document().isEmpty() is cheap; the full toPlainText() copy only happens when there is text.
+        self._prompt_ready = not self.prompt_edit.document().isEmpty() and bool(self.prompt_edit.toPlainText().strip()); self._refresh_start_enabled()
+
+    def _refresh_start_enabled(self):
+        self.start_button.setEnabled(self._input_ready and self._output_ready and self._prompt_ready)
 
     def create_separator(self):
         separator = QFrame(); separator.setObjectName("Separator"); separator.setFrameShape(QFrame.Shape.HLine); separator.setFrameShadow(QFrame.Shadow.Sunken); return separator
 
+    @Slot()
     def show_prompting_tips(self):
         title = "Prompting Tips"
         try:
-            current_dir = os.path.dirname(os.path.abspath(__file__)); tips_path = os.path.join(current_dir, "..", "..", "docs", "prompt_tips.txt")
-            with open(tips_path, 'r', encoding='utf-8') as f: text = f.read()
-            msg_box = QMessageBox(self); msg_box.setWindowTitle(title); msg_box.setText(text); msg_box.setTextFormat(Qt.TextFormat.RichText); msg_box.addButton(QMessageBox.StandardButton.Ok); msg_box.setIcon(QMessageBox.Icon.NoIcon); msg_box.exec()
+            if MainWindow._tips_text is None:
+                with open(_DOCS / "prompt_tips.txt", 'r', encoding='utf-8') as f: MainWindow._tips_text = f.read()
+            msg_box = QMessageBox(self); msg_box.setWindowTitle(title); msg_box.setText(MainWindow._tips_text); msg_box.setTextFormat(Qt.TextFormat.RichText); msg_box.addButton(QMessageBox.StandardButton.Ok); msg_box.setIcon(QMessageBox.Icon.NoIcon); msg_box.exec()
         except FileNotFoundError: QMessageBox.warning(self, "Error", "Could not find 'prompt_tips.txt'.")
         except Exception as e: QMessageBox.warning(self, "Error", f"An error occurred: {e}")
 
     def populate_models_combo(self, model_list: list[str]):
-        self.model_combo.clear(); default_index = -1
-        for i, model_name in enumerate(model_list):
-            display_text = model_name
-            for key, hints in MODEL_HINTS.items():
-                if key in model_name: display_text = f"{hints['icon']} {model_name} ({hints['category']})"; break
-            self.model_combo.addItem(display_text, userData=model_name)
-            # --- FIX: Look for 2.5 flash as default ---
-            if "gemini-2.5-flash" in model_name: default_index = i
-        if default_index != -1: self.model_combo.setCurrentIndex(default_index)
-
+        default_index = -1
+        # Python-side mirrors of the combo items, so lookups don't go through itemText()/itemData().
+        self._model_names = list(model_list); self._display_to_index = {}
+        # Rebuild silently: one currentIndexChanged and one view repaint at the end instead of one per item.
+        self.model_combo.blockSignals(True); self.model_combo.view().setUpdatesEnabled(False)
+        try:
+            self.model_combo.clear()
+            for i, model_name in enumerate(model_list):
+                display_text = self._display_cache.get(model_name)
+                if display_text is None:
+                    display_text = model_name
+                    for key, icon, category in _MODEL_HINT_LIST:
+                        if key in model_name: display_text = f"{icon} {model_name} ({category})"; break
+                    self._display_cache[model_name] = display_text
+                self.model_combo.addItem(display_text, userData=model_name)
+                self._display_to_index.setdefault(display_text, i)
+                # --- FIX: Look for 2.5 flash as default ---
+                if "gemini-2.5-flash" in model_name: default_index = i
+            if default_index != -1: self.model_combo.setCurrentIndex(default_index)
+        finally:
+            self.model_combo.view().setUpdatesEnabled(True); self.model_combo.blockSignals(False)
+        self.model_combo.currentIndexChanged.emit(self.model_combo.currentIndex())
+
+    @Slot()
     def confirm_reset_settings(self):
         msg_box = QMessageBox(self); msg_box.setWindowTitle("Confirm Reset"); msg_box.setText("Are you sure you want to reset all settings on this page?"); msg_box.setInformativeText("This will clear the prompt, folder paths, and reset model options. This action cannot be undone.")
         msg_box.setStandardButtons(QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No); msg_box.setDefaultButton(QMessageBox.StandardButton.No); msg_box.setIcon(QMessageBox.Icon.Warning)
         if msg_box.exec() == QMessageBox.StandardButton.Yes:
             print("User confirmed reset. Resetting all settings.")
             self.input_path_edit.clear(); self.output_path_edit.clear(); self.prompt_edit.clear()
-            self.output_ext_edit.clear(); self.delay_spinbox.setValue(10); self.thinking_mode_checkbox.setChecked(False); self.subfolders_checkbox.setChecked(False)
+            self.output_ext_edit.clear(); self.delay_spinbox.setValue(10); self.thinking_mode_checkbox.setChecked(False); self.subfolders_checkbox.setChecked(False); self.response_cache_checkbox.setChecked(False)
             self.set_default_model()
 
     def set_default_model(self):
         default_index = -1
-        for i in range(self.model_combo.count()):
-            model_name = self.model_combo.itemData(i)
+        for i, model_name in enumerate(self._model_names):
             # --- FIX: Look for 2.5 flash as default ---
             if "gemini-2.5-flash" in model_name: default_index = i; break
         if default_index != -1: self.model_combo.setCurrentIndex(default_index)
 
+    @Slot()
     def browse_for_input_folder(self):
         folder_path = QFileDialog.getExistingDirectory(self, "Select Input Folder");
         if folder_path: self.input_path_edit.setText(folder_path)
 
+    @Slot()
     def browse_for_output_folder(self):
         folder_path = QFileDialog.getExistingDirectory(self, "Select Output Folder");
         if folder_path: self.output_path_edit.setText(folder_path)
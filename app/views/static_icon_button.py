@@ -2,8 +2,8 @@
 # This file contains a custom QPushButton that ensures its icon never changes color.
 
 from PySide6.QtWidgets import QPushButton
-from PySide6.QtGui import QIcon, QPainter, QPaintEvent
-from PySide6.QtCore import Qt, QSize, QRect
+from PySide6.QtGui import QIcon, QPainter, QPaintEvent, QPixmap, QPixmapCache, QResizeEvent
+from PySide6.QtCore import Qt, QSize, QRect, QEvent
 
 class StaticIconButton(QPushButton):
     """
@@ -18,17 +18,69 @@ class StaticIconButton(QPushButton):
         self._icon = QIcon()
         self._icon_size = QSize(16, 16) # Default icon size
         self._icon_padding = 8 # Space between icon and text
+        # Rasterizing the icon and measuring the text are too slow to redo on every hover repaint.
+        # The pixmap lives in QPixmapCache, so buttons sharing an icon share one rasterization.
+        self._pixmap_key = ""
+        self._icon_rect: QRect | None = None # Computed on the next paint, once the stylesheet font is applied
 
     def setIcon(self, icon: QIcon):
         """Sets the icon to be displayed."""
         self._icon = icon
+        self._update_pixmap()
+        self._icon_rect = None
         self.update() # Trigger a repaint
 
     def setIconSize(self, size: QSize):
         """Sets the size for the icon to be drawn."""
         self._icon_size = size
+        self._update_pixmap()
+        self._icon_rect = None
         self.update()
 
+    def setText(self, text: str):
+        super().setText(text)
+        self._icon_rect = None
+
+    def resizeEvent(self, event: QResizeEvent):
+        self._icon_rect = None
+        super().resizeEvent(event)
+
+    def changeEvent(self, event: QEvent):
+        # Font and style changes move the text and the contents margins.
+        if event.type() in (QEvent.Type.FontChange, QEvent.Type.StyleChange):
+            self._icon_rect = None
+        super().changeEvent(event)
+
+    def _update_pixmap(self):
+        self._pixmap_key = f"{self._icon.cacheKey()}-{self._icon_size.width()}x{self._icon_size.height()}"
+
+    def _icon_pixmap(self) -> QPixmap:
+        """Returns the icon rasterized at the current size, from QPixmapCache when possible."""
+        pixmap = QPixmap()
+        if not QPixmapCache.find(self._pixmap_key, pixmap):
+            pixmap = self._icon.pixmap(self._icon_size, QIcon.Mode.Normal, QIcon.State.Off)
+            QPixmapCache.insert(self._pixmap_key, pixmap)
+        return pixmap
+
+    def _compute_icon_rect(self) -> QRect:
+        """Returns the rectangle the icon is drawn in, to the left of the centred text."""
+        # Get the full rectangle of the button's contents
+        content_rect = self.contentsRect()
+        # Get the width that the text occupies
+        text_width = self.fontMetrics().horizontalAdvance(self.text())
+
+        # Position the icon to the left of the text
+        # Total width of icon + padding + text
+        total_width = self._icon_size.width() + self._icon_padding + text_width
+
+        # Starting X position for the icon
+        icon_x = content_rect.x() + (content_rect.width() - total_width) / 2
+        # Center the icon vertically
+        icon_y = content_rect.y() + (content_rect.height() - self._icon_size.height()) / 2
+
+        # --- FIX: Use the icon's height, not the button's height ---
+        return QRect(int(icon_x), int(icon_y), self._icon_size.width(), self._icon_size.height())
+
     def paintEvent(self, event: QPaintEvent):
         """
         Overrides the default paint event to draw the button and then
@@ -39,31 +91,14 @@ class StaticIconButton(QPushButton):
         super().paintEvent(event)
 
         # Now, draw our icon on top of the already-drawn button.
-        if not self._icon.isNull():
-            painter = QPainter(self)
-            painter.setRenderHint(QPainter.RenderHint.Antialiasing)
-
-            # --- Calculate Icon Position ---
-            # Get the full rectangle of the button's contents
-            content_rect = self.contentsRect()
-            # Get the rectangle that the text occupies
-            text_rect = painter.fontMetrics().boundingRect(self.text())
-
-            # Position the icon to the left of the text
-            # Total width of icon + padding + text
-            total_width = self._icon_size.width() + self._icon_padding + text_rect.width()
-
-            # Starting X position for the icon
-            icon_x = content_rect.x() + (content_rect.width() - total_width) / 2
-            # Center the icon vertically
-            icon_y = content_rect.y() + (content_rect.height() - self._icon_size.height()) / 2
-
-            # --- FIX: Use the icon's height, not the button's height ---
-            # The actual rectangle where the icon will be drawn
-            icon_draw_rect = QRect(int(icon_x), int(icon_y), self._icon_size.width(), self._icon_size.height())
-
-            # --- Draw the Icon ---
-            # We use painter.drawPixmap, which does not get affected by color styles.
-            # We get the pixmap from the QIcon for the "normal" state only.
-            pixmap = self._icon.pixmap(self._icon_size, QIcon.Mode.Normal, QIcon.State.Off)
-            painter.drawPixmap(icon_draw_rect, pixmap)
\ No newline at end of file
+        # Without an icon there is nothing to measure or paint, so no QPainter is created.
+        if self._icon.isNull():
+            return
+        if self._icon_rect is None:
+            self._icon_rect = self._compute_icon_rect()
+        painter = QPainter(self)
+
+        # --- Draw the Icon ---
+        # We use painter.drawPixmap, which does not get affected by color styles.
+        # The cached pixmap comes from the QIcon's "normal" state only.
+        painter.drawPixmap(self._icon_rect, self._icon_pixmap())
\ No newline at end of file
@@ -8,8 +8,8 @@ from PySide6.QtWidgets import (
 from PySide6.QtCore import Qt, QTimer, QThread, Signal
 from PySide6.QtGui import QFont
 
-# We no longer import anything from api_handler for validation.
-# The validation is now fully self-contained in the thread.
+# api_handler itself is light; google.generativeai is only imported by get_genai, once per process.
+from ..logic.api_handler import get_genai, configure_api_key
 
 class ApiKeyValidator(QThread):
     """
@@ -26,23 +26,29 @@ class ApiKeyValidator(QThread):
     def run(self):
         """
         The function that will be executed in the separate thread.
-        All imports and library calls are contained here. If the thread
+        All library calls are contained here. If the thread
         crashes or the library state gets "poisoned", it does not affect
         the main application.
         """
         try:
-            # Import the library ONLY inside the thread.
-            import google.generativeai as genai
+            # The first call pays for the import, inside this thread; later validations reuse the module.
+            genai = get_genai()
 
             if not self.api_key:
                 self.validation_finished.emit(False)
                 return
 
+            # The window abandons validators when the key is edited, so skip the network call if this one already is.
+            if self.isInterruptionRequested():
+                return
+
             # This is the dangerous call. It happens in isolation.
-            genai.configure(api_key=self.api_key)
+            # Going through configure_api_key keeps the shared "last key" in sync and skips unchanged keys.
+            configure_api_key(self.api_key)
 
-            # A simple, low-cost operation to test the key.
-            genai.GenerativeModel('gemini-2.5-flash').count_tokens("test")
+            # A simple, low-cost operation to test the key: one page of the model list.
+            # Unlike count_tokens, it needs no GenerativeModel and no model-specific call.
+            next(iter(genai.list_models(page_size=1)), None)
 
             # If we reached here, the key is valid.
             self.validation_finished.emit(True)
@@ -59,6 +65,9 @@ class WelcomeWindow(QMainWindow):
     when the user submits a valid key.
     """
     api_key_submitted = Signal(str)
+    # Keys confirmed valid during this session, shared by every WelcomeWindow so "Change API Key" can skip the network.
+    # Failures are not stored, since they may only mean the connection was down.
+    _validated: set[str] = set()
 
     def __init__(self, saved_key: str | None = None):
         super().__init__()
@@ -89,6 +98,10 @@ class WelcomeWindow(QMainWindow):
 
         # --- SIMPLIFIED VALIDATION MECHANISM ---
         self.validator_thread = None
+        # The stripped key being validated, or whose result is on screen. None once the text moves away from it.
+        self._in_flight_key: str | None = None
+        # Abandoned validators that are still running. A running QThread must stay referenced until it ends.
+        self._old_threads: list[ApiKeyValidator] = []
         self.debounce_timer = QTimer(self)
         self.debounce_timer.setInterval(750) # 750ms delay after user stops typing.
         self.debounce_timer.setSingleShot(True)
@@ -100,25 +113,48 @@ class WelcomeWindow(QMainWindow):
         if saved_key:
             self.api_key_input.setText(saved_key)
             self.start_validation() # Automatically validate saved key on startup
+            self.debounce_timer.stop() # setText already queued a validation of the same key
 
-    def on_text_changed(self):
+    def on_text_changed(self, text: str):
         """Reset status and start the countdown to validate."""
+        # Edits that only touch surrounding whitespace leave the key, and its check or result, as they are.
+        if self._in_flight_key is not None and text.strip() == self._in_flight_key:
+            return
         self.continue_button.setEnabled(False)
         self.status_label.setText("...")
         self.status_label.setStyleSheet("color: #c5c5d4;")
+        # Whatever the current validator finds out is about a key that is no longer in the box.
+        self._abandon_validator()
         self.debounce_timer.start()
 
+    def _abandon_validator(self):
+        """Detaches the current validator so its result is dropped, keeping it alive until it finishes."""
+        self._old_threads = [thread for thread in self._old_threads if thread.isRunning()]
+        self._in_flight_key = None
+        thread = self.validator_thread
+        if thread is None:
+            return
+        self.validator_thread = None
+        thread.validation_finished.disconnect(self.on_validation_finished)
+        if thread.isRunning():
+            thread.requestInterruption()
+            thread.quit()
+            self._old_threads.append(thread)
+
     def start_validation(self):
         """The robust way to start the validation thread."""
-        # If a thread is already running, do nothing. Wait for it to finish.
-        if self.validator_thread and self.validator_thread.isRunning():
-            return
+        # The newest key always gets a fresh validation; an older one still running is abandoned.
+        self._abandon_validator()
 
-        api_key = self.api_key_input.text()
-        if not api_key.strip():
+        api_key = self.api_key_input.text().strip()
+        if not api_key:
             self.status_label.setText("Enter an API key to begin.")
             self.status_label.setStyleSheet("color: #c5c5d4;")
             return
+        self._in_flight_key = api_key
+        if api_key in self._validated:
+            self._show_validation_result(True)
+            return
 
         # State 1: CHECKING
         self.status_label.setText("Checking key...")
@@ -135,10 +171,15 @@ class WelcomeWindow(QMainWindow):
         Called when the validation thread is done.
         Handles the two possible outcomes: valid or invalid.
         """
-        # Ignore result if user has changed the text in the meantime.
-        if self.api_key_input.text().strip() != self.validator_thread.api_key:
+        # Ignore results from abandoned validators, or if the user has changed the text in the meantime.
+        validator = self.sender()
+        if validator is None or validator is not self.validator_thread or validator.api_key != self._in_flight_key:
             return
+        if is_valid:
+            self._validated.add(validator.api_key)
+        self._show_validation_result(is_valid)
 
+    def _show_validation_result(self, is_valid: bool):
         if is_valid:
             # State 2: VALID
             self.status_label.setText("✅ API Key is valid!")
@@ -3,15 +3,17 @@
 
 import sys
 import os
-import requests
-from packaging.version import parse as parse_version
+import json
+import time
+import threading
 from PySide6.QtWidgets import QApplication, QMessageBox
-from PySide6.QtCore import QFile, QTextStream, QThread, Signal, QObject, QUrl
+from PySide6.QtCore import QFile, Signal, QObject, QUrl
 from PySide6.QtGui import QFontDatabase, QIcon, QDesktopServices
+from PySide6.QtNetwork import QNetworkAccessManager, QNetworkRequest, QNetworkReply, QNetworkInformation
 import ctypes
 
 from app.logic.settings_handler import SettingsHandler
-from app.logic.api_handler import GeminiAPIHandler
+from app.logic.api_handler import GeminiAPIHandler, preload_genai
 from app.views.welcome_window import WelcomeWindow
 from app.views.main_window import MainWindow
 
@@ -31,47 +33,118 @@ VERSION_INFO_URL = "https://gist.githubusercontent.com/FlatPotato/844cfcc9d83713
 # so they can log into their account and download the new version.
 STORE_PAGE_URL = "https://flatpotato22.itch.io/flatgem" # REPLACE WITH YOUR LINK
 
+# 4. HOW OFTEN TO CHECK
+# Launches within this many seconds of the last successful check skip it.
+UPDATE_CHECK_INTERVAL = 24 * 3600
+
+# Console logging is off in release builds; set FLATGEM_DEBUG=1 to turn it on.
+# A frozen windowed build has no console, so printing there is wasted work.
+DEBUG = os.environ.get("FLATGEM_DEBUG") == "1"
+
+
+def version_tuple(version: str) -> tuple[int, ...]:
+    """
+    Turns a dotted version like "1.10.0" into (1, 10) so versions compare numerically.
+    Trailing zeros are dropped, so "1.0" and "1.0.0" are equal. Raises ValueError for non-numeric parts.
+    """
+    parts = [int(part) for part in version.strip().lstrip("vV").split(".")]
+    while parts and parts[-1] == 0:
+        parts.pop()
+    return tuple(parts)
+
 
 # --- This is the update check mechanism itself. It runs in the background. ---
 class UpdateChecker(QObject):
     """
-    A worker that checks for updates in a separate thread.
+    Checks for updates with Qt's asynchronous networking, so no extra thread is needed.
     It does not interfere with the program's launch.
     """
     # A signal that is emitted if a new version is found.
     # It passes the new version number (str) and its release notes (str).
     update_found = Signal(str, str)
 
-    def run(self):
-        """Downloads the info file and compares versions."""
+    def __init__(self, settings_handler: SettingsHandler, parent=None):
+        super().__init__(parent)
+        self._settings_handler = settings_handler
+        self._cached: dict = {} # ETag, Last-Modified and version data from the previous check
+        self._network = QNetworkAccessManager(self)
+        self._network.finished.connect(self._on_reply_finished)
+        self._reply: QNetworkReply | None = None # The request in flight, if any
+
+    def check(self):
+        """Starts downloading the info file. The event loop delivers the result to _on_reply_finished."""
+        self._cached = self._settings_handler.load_update_check(VERSION_INFO_URL)
+        if time.time() - self._cached.get("checked_at", 0) < UPDATE_CHECK_INTERVAL:
+            if DEBUG: print("Skipping update check: already checked recently.")
+            return
+        if self._is_offline():
+            if DEBUG: print("Skipping update check: no network connection.")
+            return
+        # For debugging, so you can see in the console that the check has started.
+        if DEBUG: print(f"Checking for updates... Current version: {CURRENT_VERSION}")
+        request = QNetworkRequest(QUrl(VERSION_INFO_URL))
+        request.setTransferTimeout(5000) # 5-second timeout.
+        # Ask for the file only if it changed since last time; otherwise the server answers 304 with no body.
+        if self._cached.get("etag"):
+            request.setRawHeader(b"If-None-Match", self._cached["etag"].encode('latin-1'))
+        if self._cached.get("last_modified"):
+            request.setRawHeader(b"If-Modified-Since", self._cached["last_modified"].encode('latin-1'))
+        self._reply = self._network.get(request)
+
+    @staticmethod
+    def _is_offline() -> bool:
+        """True only if the OS reports no network at all. Platforms without a reachability backend count as online."""
+        if not QNetworkInformation.loadDefaultBackend():
+            return False
+        return QNetworkInformation.instance().reachability() == QNetworkInformation.Reachability.Disconnected
+
+    def cancel(self):
+        """Aborts a check that is still in flight, e.g. when the application quits."""
+        if self._reply is not None:
+            self._reply.abort()
+
+    def _on_reply_finished(self, reply: QNetworkReply):
+        """Compares the downloaded version with the current one."""
+        reply.deleteLater()
+        if reply is self._reply:
+            self._reply = None
+        if reply.error() == QNetworkReply.NetworkError.OperationCanceledError:
+            return
+        # This will happen if the user has no internet or GitHub Gist is down.
+        # The program will not crash but will simply skip the check.
+        if reply.error() != QNetworkReply.NetworkError.NoError:
+            if DEBUG: print(f"Update check failed: Could not connect. {reply.errorString()}")
+            return
         try:
-            # For debugging, so you can see in the console that the check has started.
-            print(f"Checking for updates... Current version: {CURRENT_VERSION}")
-
-            # We make an internet request to your link. 5-second timeout.
-            response = requests.get(VERSION_INFO_URL, timeout=5)
-            response.raise_for_status()  # If the site doesn't respond, it will raise an error
-
-            # Convert the response text into a format Python can understand
-            data = response.json()
+            if reply.attribute(QNetworkRequest.Attribute.HttpStatusCodeAttribute) == 304:
+                # Not modified: reuse the version data saved with the validators.
+                data = self._cached.get("data")
+                if not data:
+                    return
+                self._cached["checked_at"] = time.time()
+                self._settings_handler.save_update_check(VERSION_INFO_URL, self._cached)
+            else:
+                # Convert the response text into a format Python can understand
+                data = json.loads(bytes(reply.readAll()).decode('utf-8'))
+                self._settings_handler.save_update_check(VERSION_INFO_URL, {
+                    "etag": bytes(reply.rawHeader(b"ETag")).decode('latin-1'),
+                    "last_modified": bytes(reply.rawHeader(b"Last-Modified")).decode('latin-1'),
+                    "data": {key: data[key] for key in ("version", "notes") if key in data},
+                    "checked_at": time.time(),
+                })
             latest_version_str = data.get("version", "0.0.0")
 
-            print(f"Latest version found online: {latest_version_str}")
+            if DEBUG: print(f"Latest version found online: {latest_version_str}")
 
-            # Compare versions. 'packaging.version' can correctly compare
-            # "1.10.0" and "1.9.0", unlike simple string comparison.
-            if parse_version(latest_version_str) > parse_version(CURRENT_VERSION):
-                print(f"Newer version found: {latest_version_str}. Notifying user.")
+            # Compare versions as tuples of numbers, which orders
+            # "1.10.0" and "1.9.0" correctly, unlike simple string comparison.
+            if version_tuple(latest_version_str) > version_tuple(CURRENT_VERSION):
+                if DEBUG: print(f"Newer version found: {latest_version_str}. Notifying user.")
                 notes = data.get("notes", "No release notes provided.")
                 # Send a signal to the main controller that it's time to show the dialog.
                 self.update_found.emit(latest_version_str, notes)
-
-        # This block will execute if the user has no internet or GitHub Gist is down.
-        # The program will not crash but will simply skip the check.
-        except requests.exceptions.RequestException as e:
-            print(f"Update check failed: Could not connect. {e}")
         except Exception as e:
-            print(f"An unexpected error occurred during update check: {e}")
+            if DEBUG: print(f"An unexpected error occurred during update check: {e}")
 
 
 # --- The main conductor of the entire application ---
@@ -79,30 +152,41 @@ class ApplicationController:
     """
     The main controller. It starts all processes, including the update check.
     """
-    def __init__(self, app):
+    def __init__(self, app, stylesheet: str = ""):
         self.app = app
+        # The theme as read at startup, kept so it can be re-applied without touching the disk.
+        self.stylesheet = stylesheet
         self.settings_handler = SettingsHandler()
+        # Settings writes are debounced, so make sure the last one reaches the disk.
+        self.app.aboutToQuit.connect(self.settings_handler.flush)
         self.welcome_window = None
         self.main_window = None
         self.last_window_center = None
 
-        # --- Setting up the thread for update checking ---
-        # 1. Create a separate "conveyor" (thread) to avoid freezing the main one.
-        self.update_thread = QThread()
-        # 2. Create our "worker".
-        self.update_checker = UpdateChecker()
-        # 3. Move the "worker" to the "thread".
-        self.update_checker.moveToThread(self.update_thread)
-        # 4. We say: "When the worker emits the 'update_found' signal, call the 'show_update_dialog' function".
+        # --- Setting up the update check ---
+        # The request is asynchronous, so it runs on the main event loop without freezing it.
+        self.update_checker = UpdateChecker(self.settings_handler)
+        # We say: "When the checker emits the 'update_found' signal, call the 'show_update_dialog' function".
         self.update_checker.update_found.connect(self.show_update_dialog)
-        # 5. We say: "When the thread starts, let the worker start its job (call its run function)".
-        self.update_thread.started.connect(self.update_checker.run)
+        # Nothing to join on exit: an unfinished request is simply aborted.
+        self.app.aboutToQuit.connect(self.update_checker.cancel)
+        self._update_check_started = False
 
     def run(self):
         """Starts the application and the update check."""
-        # Give the command to "start the thread". The check will run in the background.
-        self.update_thread.start()
-
+        self.start_update_check()
+        self.show_initial_ui()
+
+    def start_update_check(self):
+        """Sends the update request, once per application run."""
+        if self._update_check_started:
+            return
+        self._update_check_started = True
+        # Send the request. The check will run in the background.
+        self.update_checker.check()
+
+    def show_initial_ui(self):
+        """Shows the welcome window, pre-filled with the saved key if there is one."""
         saved_key = self.settings_handler.load_api_key()
         self.show_welcome_window(saved_key)
 
@@ -125,10 +209,6 @@ class ApplicationController:
         if msg_box.clickedButton() == update_button:
             QDesktopServices.openUrl(QUrl(STORE_PAGE_URL))
 
-        # After the dialog has been shown, we no longer need the thread. Shut it down.
-        self.update_thread.quit()
-        self.update_thread.wait()
-
     # --- Rest of the controller code without changes ---
     def show_welcome_window(self, saved_key: str | None = None):
         self.welcome_window = WelcomeWindow(saved_key=saved_key)
@@ -168,16 +248,12 @@ class ApplicationController:
         if self.main_window:
             self.last_window_center = self.main_window.geometry().center()
             self.main_window.close()
-        # This correctly re-runs the application logic from the start,
-        # including loading any saved keys.
-        self.run()
+        # Back to the welcome window, including loading any saved keys.
+        # The update check already ran for this session, so it is not repeated.
+        self.show_initial_ui()
 
     def handle_main_window_close(self, current_state: dict):
         self.settings_handler.save_main_window_state(current_state)
-        # If the thread is still running, shut it down when the program closes.
-        if self.update_thread.isRunning():
-            self.update_thread.quit()
-            self.update_thread.wait()
 
 
 def main():
@@ -185,40 +261,51 @@ def main():
     The main function to initialize and run the application.
     """
     app = QApplication(sys.argv)
+    # The genai import takes hundreds of milliseconds, so it runs while the fonts, stylesheet and first window load.
+    threading.Thread(target=preload_genai, name="genai-preload", daemon=True).start()
     script_dir = os.path.dirname(os.path.abspath(__file__))
 
     if sys.platform == 'win32':
         myappid = 'flatpotato.flatgem.1'
-        ctypes.windll.shell32.SetCurrentProcessExplicitAppUserModelID(myappid)
-        print(f"Windows AppUserModelID set to: {myappid}")
+        # Declaring the signature lets ctypes pass the string without guessing its type.
+        set_app_user_model_id = ctypes.WinDLL("shell32", use_last_error=True).SetCurrentProcessExplicitAppUserModelID
+        set_app_user_model_id.argtypes = [ctypes.c_wchar_p]
+        set_app_user_model_id.restype = ctypes.c_long # HRESULT
+        set_app_user_model_id(myappid)
+        if DEBUG: print(f"Windows AppUserModelID set to: {myappid}")
 
     icon_path = os.path.join(script_dir, "assets", "icons", "flatgemlogo.png")
-    if os.path.exists(icon_path):
-        app.setWindowIcon(QIcon(icon_path))
-        print("Application icon loaded successfully.")
+    # QIcon is null if the file is missing, so there is no need to stat it first.
+    app_icon = QIcon(icon_path)
+    if not app_icon.isNull():
+        app.setWindowIcon(app_icon)
+        if DEBUG: print("Application icon loaded successfully.")
     else:
-        print(f"Warning: Application icon not found at '{icon_path}'.")
+        if DEBUG: print(f"Warning: Application icon not found at '{icon_path}'.")
 
     font_path = os.path.join(script_dir, "assets", "fonts", "Roboto-Regular.ttf")
     font_id = QFontDatabase.addApplicationFont(font_path)
     if font_id != -1:
         font_families = QFontDatabase.applicationFontFamilies(font_id)
         if font_families:
-            print(f"Successfully loaded font: '{font_families[0]}'")
+            if DEBUG: print(f"Successfully loaded font: '{font_families[0]}'")
     else:
-        print(f"Warning: Failed to load font at '{font_path}'.")
+        if DEBUG: print(f"Warning: Failed to load font at '{font_path}'.")
 
+    stylesheet = ""
     try:
         stylesheet_path = os.path.join(script_dir, "styles", "dark_theme.qss")
         style_file = QFile(stylesheet_path)
-        if style_file.open(QFile.OpenModeFlag.ReadOnly | QFile.OpenModeFlag.Text):
-            stream = QTextStream(style_file)
-            app.setStyleSheet(stream.readAll())
-            print("Stylesheet loaded successfully.")
+        if style_file.open(QFile.OpenModeFlag.ReadOnly):
+            # The file is UTF-8, so the raw bytes are decoded directly instead of going through QTextStream.
+            stylesheet = bytes(style_file.readAll()).decode('utf-8')
+            style_file.close()
+            app.setStyleSheet(stylesheet)
+            if DEBUG: print("Stylesheet loaded successfully.")
     except Exception as e:
-        print(f"An error occurred while loading the stylesheet: {e}")
+        if DEBUG: print(f"An error occurred while loading the stylesheet: {e}")
 
-    controller = ApplicationController(app)
+    controller = ApplicationController(app, stylesheet=stylesheet)
     controller.run()
 
     sys.exit(app.exec())